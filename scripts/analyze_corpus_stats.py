@@ -9,47 +9,22 @@ Calculates:
 - Script type distribution
 """
 
-import csv
 import json
-from collections import Counter
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from common.corpus_loader import load_corpus
+
 def analyze_corpus(csv_path: str):
     """Analyze the sentence corpus and return statistics."""
 
-    unique_chars = set()
-    sentence_count = 0
-    script_type_counts = Counter()
-
-    with open(csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)  # Default delimiter is ','
-
-        for row in reader:
-            sentence_count += 1
-            script_type = row.get('script_type', 'unknown')
-            script_type_counts[script_type] += 1
-
-            # Parse character-pinyin mapping
-            char_pinyin_str = row.get('char_pinyin_pairs', '')
-            if not char_pinyin_str:
-                continue
-
-            # Format: "char1:pinyin1|char2:pinyin2|..."
-            pairs = char_pinyin_str.split('|')
-            for pair in pairs:
-                if ':' not in pair:
-                    continue
-
-                char, pinyin = pair.split(':', 1)
-
-                # Only count Chinese characters (those with pinyin)
-                if pinyin and pinyin.strip():
-                    unique_chars.add(char)
+    corpus = load_corpus(csv_path)
 
     stats = {
-        'totalSentences': sentence_count,
-        'totalCharsInCorpus': len(unique_chars),
-        'scriptTypeDistribution': dict(script_type_counts),
+        'totalSentences': corpus.sentence_count,
+        'totalCharsInCorpus': len(corpus.unique_chars),
+        'scriptTypeDistribution': dict(corpus.script_type_counts),
         'generatedAt': None  # Will be set by caller
     }
 
@@ -11,11 +11,35 @@ This script:
 6. Generates enumeration JSON ready for Azure TTS
 """
 
-import csv
-import json
+import heapq
 import re
+import sys
 from pathlib import Path
-from typing import Dict, List, Set, Optional
+from typing import Dict, List, Set, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.corpus_loader import TONE_DIGITS, load_corpus
+from common.json_io import write_json
+
+# Mapping of tone mark characters to (base, tone)
+TONE_MARKS = {
+    # Tone 1
+    'ā': ('a', 1), 'ē': ('e', 1), 'ī': ('i', 1), 'ō': ('o', 1), 'ū': ('u', 1), 'ǖ': ('ü', 1),
+    # Tone 2
+    'á': ('a', 2), 'é': ('e', 2), 'í': ('i', 2), 'ó': ('o', 2), 'ú': ('u', 2), 'ǘ': ('ü', 2),
+    # Tone 3
+    'ǎ': ('a', 3), 'ě': ('e', 3), 'ǐ': ('i', 3), 'ǒ': ('o', 3), 'ǔ': ('u', 3), 'ǚ': ('ü', 3),
+    # Tone 4
+    'à': ('a', 4), 'è': ('e', 4), 'ì': ('i', 4), 'ò': ('o', 4), 'ù': ('u', 4), 'ǜ': ('ü', 4),
+}
+
+# str.translate table stripping tone marks, and tone number per marked char
+TONE_MARK_BASES = str.maketrans({mark: base for mark, (base, _) in TONE_MARKS.items()})
+TONE_MARK_TONES = {mark: tone for mark, (_, tone) in TONE_MARKS.items()}
+TONE_MARK_PATTERN = re.compile('[' + ''.join(TONE_MARKS) + ']')
+
+# Valid characters of a tone3 syllable base (tone digit is checked separately)
+SYLLABLE_LETTERS = frozenset('abcdefghijklmnopqrstuvwxyzü')
 
 
 def extract_unihan_syllables(unihan_path: str) -> Set[str]:
@@ -24,22 +48,25 @@ def extract_unihan_syllables(unihan_path: str) -> Set[str]:
 
     Returns set of syllables with tone marks (e.g., 'yī', 'hǎo', 'ma')
     """
-    syllables = set()
+    syllables: Set[str] = set()
+    field = b'\tkMandarin\t'
 
-    with open(unihan_path, 'r', encoding='utf-8') as f:
+    # Scan raw bytes and decode only the kMandarin values
+    with open(unihan_path, 'rb') as f:
         for line in f:
             # Skip comments and empty lines
-            if line.startswith('#') or not line.strip():
+            if line[:1] == b'#':
                 continue
 
             # Look for kMandarin entries
-            if '\tkMandarin\t' in line:
-                parts = line.strip().split('\t')
-                if len(parts) >= 3:
-                    # Format: U+4E00\tkMandarin\tyī
-                    reading = parts[2].strip()
-                    if reading:
-                        syllables.add(reading)
+            # Format: U+4E00\tkMandarin\tyī
+            idx = line.find(field)
+            if idx < 0:
+                continue
+
+            reading = line[idx + len(field):].split(b'\t', 1)[0].strip()
+            if reading:
+                syllables.add(reading.decode('utf-8'))
 
     return syllables
 
@@ -51,7 +78,7 @@ def split_multiple_readings(syllables: Set[str]) -> Set[str]:
     Input: {'biào biāo', 'yī'}
     Output: {'biào', 'biāo', 'yī'}
     """
-    split_syllables = set()
+    split_syllables: Set[str] = set()
 
     for syll in syllables:
         # Split by space to handle multiple readings
@@ -79,30 +106,9 @@ def convert_tone_mark_to_number(pinyin_with_mark: str) -> tuple[str, Optional[in
     - Tone 4 (grave):  à è ì ò ù ǜ
     - Neutral: a e i o u ü (no marks)
     """
-    # Mapping of tone mark characters to (base, tone)
-    tone_map = {
-        # Tone 1
-        'ā': ('a', 1), 'ē': ('e', 1), 'ī': ('i', 1), 'ō': ('o', 1), 'ū': ('u', 1), 'ǖ': ('ü', 1),
-        # Tone 2
-        'á': ('a', 2), 'é': ('e', 2), 'í': ('i', 2), 'ó': ('o', 2), 'ú': ('u', 2), 'ǘ': ('ü', 2),
-        # Tone 3
-        'ǎ': ('a', 3), 'ě': ('e', 3), 'ǐ': ('i', 3), 'ǒ': ('o', 3), 'ǔ': ('u', 3), 'ǚ': ('ü', 3),
-        # Tone 4
-        'à': ('a', 4), 'è': ('e', 4), 'ì': ('i', 4), 'ò': ('o', 4), 'ù': ('u', 4), 'ǜ': ('ü', 4),
-    }
-
-    # Find tone mark in the syllable
-    base_chars = []
-    tone = None
-
-    for char in pinyin_with_mark:
-        if char in tone_map:
-            base_char, tone = tone_map[char]
-            base_chars.append(base_char)
-        else:
-            base_chars.append(char)
-
-    base = ''.join(base_chars)
+    base = pinyin_with_mark.translate(TONE_MARK_BASES)
+    match = TONE_MARK_PATTERN.search(pinyin_with_mark)
+    tone = TONE_MARK_TONES[match.group()] if match else None
     return (base, tone)
 
 
@@ -115,7 +121,7 @@ def convert_to_tone3(syllables_with_marks: Set[str]) -> Set[str]:
 
     Note: Neutral tones are marked as 0 for AWS Polly compatibility.
     """
-    tone3_syllables = set()
+    tone3_syllables: Set[str] = set()
 
     for syll in syllables_with_marks:
         base, tone = convert_tone_mark_to_number(syll)
@@ -144,49 +150,47 @@ def create_syllable_metadata(
     - exists_in_dataset: whether this syllable appears in our sentences
     """
     # Use dict to deduplicate by pinyin_tone3 (our canonical format with v)
-    syllable_dict = {}
+    syllable_dict: Dict[str, Tuple[str, Optional[int]]] = {}
+
+    # Convert ü to v for our internal format (canonical key) with a single
+    # replace over all syllables instead of one call per syllable
+    syllables = list(tone3_syllables)
+    syllables_v = '\n'.join(syllables).replace('ü', 'v').split('\n')
 
-    for syll in tone3_syllables:
+    for syll, syll_v in zip(syllables, syllables_v):
         # Extract base and tone
         # Format: 'yi1', 'hao3', 'ma' (neutral has no number)
-        match = re.match(r'^([a-zü]+?)(\d?)$', syll)
+        if syll_v and syll_v[-1] in TONE_DIGITS:
+            base_v, tone_str = syll_v[:-1], syll_v[-1]
+        else:
+            base_v, tone_str = syll_v, ''
 
-        if not match:
+        if not base_v or not SYLLABLE_LETTERS.issuperset(base_v):
             print(f"Warning: Could not parse syllable '{syll}', skipping")
             continue
 
-        base = match.group(1)
-        tone_str = match.group(2)
         tone = int(tone_str) if tone_str else None
-
-        # Convert ü to v for our internal format (canonical key)
-        base_v = base.replace('ü', 'v')
-        pinyin_tone3 = f"{base_v}{tone_str}" if tone_str else base_v
+        pinyin_tone3 = sys.intern(base_v + tone_str)
 
         # Skip if we already have this syllable (prefer ü version from Unihan)
         if pinyin_tone3 in syllable_dict:
             continue
 
-        # Keep proper pinyin with ü for display purposes
-        base_proper = base_v.replace('v', 'ü')
-
-        # Filename uses v (ASCII-safe)
-        filename = pinyin_tone3
-
-        # Check if this syllable exists in our dataset
-        exists_in_dataset = pinyin_tone3 in dataset_syllables
+        # Only the parsed fields are kept here; dicts are built once, in order
+        syllable_dict[pinyin_tone3] = (base_v, tone)
 
-        syllable_dict[pinyin_tone3] = {
+    # Convert dict to sorted list
+    return [
+        {
             'base': base_v,  # Store v version as canonical
-            'base_proper': base_proper,  # ü version for display
+            'base_proper': base_v.replace('v', 'ü'),  # ü version for display
             'tone': tone,
             'pinyin_tone3': pinyin_tone3,
-            'filename': filename,
-            'exists_in_dataset': exists_in_dataset,
+            'filename': pinyin_tone3,  # Filename uses v (ASCII-safe)
+            'exists_in_dataset': pinyin_tone3 in dataset_syllables,
         }
-
-    # Convert dict to sorted list
-    return [syllable_dict[key] for key in sorted(syllable_dict.keys())]
+        for pinyin_tone3, (base_v, tone) in sorted(syllable_dict.items())
+    ]
 
 
 def parse_sentence_dataset(csv_path: str) -> Set[str]:
@@ -198,36 +202,14 @@ def parse_sentence_dataset(csv_path: str) -> Set[str]:
     Note: Converts neutral tones from no-number format to '0' suffix format
     for AWS Polly compatibility (e.g., "ma" → "ma0").
     """
-    used_syllables = set()
-
     if not Path(csv_path).exists():
-        return used_syllables
-
-    with open(csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            char_pinyin_pairs = row.get('char_pinyin_pairs', '')
-            if not char_pinyin_pairs:
-                continue
+        return set()
 
-            # Format: 我:wo3|們:men|試:shi4|試:shi4|看:kan4|！:
-            pairs = char_pinyin_pairs.split('|')
-            for pair in pairs:
-                if ':' not in pair:
-                    continue
-                char, pinyin = pair.split(':', 1)
-                pinyin = pinyin.strip()
-                if pinyin:  # Skip empty strings (punctuation)
-                    # AWS Polly requires neutral tones to have explicit '0' suffix
-                    # Convert "ma" → "ma0" for consistency
-                    if not pinyin[-1].isdigit():
-                        pinyin = f"{pinyin}0"
-                    used_syllables.add(pinyin)
+    # Shared single pass with analyze_corpus_stats.py (cached by file mtime)
+    return set(load_corpus(csv_path).used_syllables)
 
-    return used_syllables
 
-
-def main():
+def main() -> None:
     # Paths
     project_root = Path(__file__).parent.parent.parent
     unihan_path = project_root / 'data' / 'sources' / 'Unihan_Readings.txt'
@@ -244,17 +226,17 @@ def main():
     print("\nStep 1: Extracting syllables from Unihan database...")
     unihan_syllables = extract_unihan_syllables(str(unihan_path))
     print(f"  Found {len(unihan_syllables)} raw entries from Unihan")
-    print(f"  Sample: {list(sorted(unihan_syllables))[:5]}")
+    print(f"  Sample: {heapq.nsmallest(5, unihan_syllables)}")
 
     print("\nStep 2: Splitting multiple readings...")
     split_syllables = split_multiple_readings(unihan_syllables)
     print(f"  After splitting: {len(split_syllables)} unique syllables")
-    print(f"  Sample: {list(sorted(split_syllables))[:5]}")
+    print(f"  Sample: {heapq.nsmallest(5, split_syllables)}")
 
     print("\nStep 3: Converting tone marks to tone3 format...")
     tone3_syllables = convert_to_tone3(split_syllables)
     print(f"  Converted to tone3: {len(tone3_syllables)} syllables")
-    print(f"  Sample: {sorted(tone3_syllables)[:10]}")
+    print(f"  Sample: {heapq.nsmallest(10, tone3_syllables)}")
 
     print("\nStep 4: Parsing sentence dataset to find used syllables...")
     dataset_syllables = parse_sentence_dataset(str(sentence_csv))
@@ -268,19 +250,19 @@ def main():
         missing_from_unihan = {s for s in missing_from_unihan if s and s != ':'}
         if missing_from_unihan:
             print(f"\n  Adding {len(missing_from_unihan)} syllables from dataset not in Unihan:")
-            print(f"  {sorted(missing_from_unihan)[:10]}")
+            print(f"  {heapq.nsmallest(10, missing_from_unihan)}")
             tone3_syllables.update(missing_from_unihan)
 
     print("\nStep 5: Generating syllable metadata...")
     syllable_list = create_syllable_metadata(tone3_syllables, dataset_syllables)
 
-    # Calculate statistics
+    # Calculate statistics (pinyin_tone3 is unique, so set sizes are counts)
+    enumerated_set = {s['pinyin_tone3'] for s in syllable_list}
     total = len(syllable_list)
-    used = sum(1 for s in syllable_list if s['exists_in_dataset'])
+    used = len(enumerated_set & dataset_syllables)
     coverage = (used / total * 100) if total > 0 else 0
 
     # Check if all dataset syllables are covered
-    enumerated_set = {s['pinyin_tone3'] for s in syllable_list}
     missing_from_unihan = dataset_syllables - enumerated_set
 
     print("\nStep 6: Writing output JSON...")
@@ -296,8 +278,7 @@ def main():
         'syllables': syllable_list,
     }
 
-    with open(output_json, 'w', encoding='utf-8') as f:
-        json.dump(metadata, f, ensure_ascii=False, indent=2)
+    write_json(output_json, metadata)
 
     print("\n" + "=" * 70)
     print("✓ Syllable enumeration complete!")
@@ -339,8 +320,8 @@ def main():
     if lv_syllables:
         print(f"\nü→v conversion examples ({len(lv_syllables)} total):")
         for s in lv_syllables[:5]:
-            used = "✓" if s['exists_in_dataset'] else " "
-            print(f"  [{used}] {s['pinyin_tone3']:8} (display: {s['base_proper']}, filename: {s['filename']}.ogg)")
+            marker = "✓" if s['exists_in_dataset'] else " "
+            print(f"  [{marker}] {s['pinyin_tone3']:8} (display: {s['base_proper']}, filename: {s['filename']}.ogg)")
 
     print("\n" + "=" * 70)
     print("Ready for TTS generation!")
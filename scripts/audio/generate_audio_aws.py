@@ -17,25 +17,32 @@ Usage:
     # Production mode (generate all ~1,478 files):
     # Set TEST_LIMIT = None in the configuration section below
 
-Expected runtime: ~30-45 minutes for full run (with rate limiting)
+Expected runtime: ~2 minutes for full run (rate limited to 20 requests/second)
 Expected output: ~1,478 OGG files in app/public/data/audio/
 
 Features:
 - Automatic resume: Skips existing files if interrupted mid-run
 - Progress tracking: Saves progress every 50 files
-- Double-check: Verifies file existence before making AWS API calls
+- Single scan: Lists existing output files once up front and skips them
 """
 
 import os
 import sys
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.json_io import append_ndjson_record, loads, write_json
+from common.polly_cache import AudioCache, describe_voices_cached
+from common.rate_limiter import TokenBucket
 
 try:
     import boto3
-    from botocore.exceptions import BotoCoreError, ClientError, NoCredentialsError
+    from botocore.config import Config
+    from botocore.exceptions import ClientError, NoCredentialsError
 except ImportError:
     print("ERROR: boto3 not installed")
     print("Install with: pip install boto3")
@@ -60,11 +67,20 @@ OUTPUT_FORMAT = 'ogg_vorbis'  # OGG Vorbis (good compression, web-friendly)
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 INPUT_JSON = PROJECT_ROOT / 'data' / 'audio' / 'syllables_enumeration.json'
 OUTPUT_DIR = PROJECT_ROOT / 'app' / 'public' / 'data' / 'audio'
+AUDIO_CACHE_DB = PROJECT_ROOT / 'data' / 'audio' / 'polly_cache.db'
 
 # Generation settings
-RATE_LIMIT_DELAY = 0.15  # seconds between requests (avoid throttling)
-PROGRESS_SAVE_INTERVAL = 50  # save progress every N files
+MAX_WORKERS = 8  # concurrent Polly requests in flight
+MAX_REQUESTS_PER_SECOND = 20  # Polly request rate shared by all workers (avoid throttling)
+MAX_POOL_CONNECTIONS = 32  # keep-alive HTTPS connections shared by workers
+MAX_RETRY_ATTEMPTS = 5  # botocore adaptive retries (backs off on throttling)
+CONNECT_TIMEOUT = 5  # seconds to establish a connection to Polly
+READ_TIMEOUT = 30  # seconds to wait for Polly to respond
+PROGRESS_SAVE_INTERVAL = 50  # flush the progress log and console every N files
+PROGRESS_COMPACT_INTERVAL = 10000  # fold the progress log into the JSON snapshot every N files
+AUDIO_CHUNK_SIZE = 8192  # bytes per read when streaming audio to disk
 RESUME_FROM_EXISTING = True  # skip files that already exist
+USE_AUDIO_CACHE = True  # reuse audio for unchanged SSML/voice across runs
 
 # TEST MODE: Set to None for full run, or a number (e.g., 10) to limit generation
 # This is useful for testing before running the full batch
@@ -75,6 +91,11 @@ TEST_LIMIT = None
 # SSML GENERATION
 # ============================================================================
 
+# Use a placeholder Chinese character (phoneme will override its pronunciation)
+SSML_PLACEHOLDER = "字"
+SSML_PREFIX = '<speak><phoneme alphabet="x-amazon-pinyin" ph="'
+SSML_SUFFIX = f'">{SSML_PLACEHOLDER}</phoneme></speak>'
+
 def generate_ssml(syllable: Dict) -> str:
     """
     Generate SSML for a single syllable using AWS Polly x-amazon-pinyin.
@@ -93,17 +114,8 @@ def generate_ssml(syllable: Dict) -> str:
           Neutral tones are marked with '0' (e.g., 'a0', 'ma0').
           Our enumeration data already uses this format.
     """
-    pinyin = syllable['pinyin_tone3']  # e.g., "ma1", "lv3", "a0"
-
-    # Use a placeholder Chinese character (phoneme will override its pronunciation)
-    placeholder = "字"
-
     # AWS Polly uses our pinyin_tone3 format directly!
-    ssml = f"""<speak>
-    <phoneme alphabet="x-amazon-pinyin" ph="{pinyin}">{placeholder}</phoneme>
-</speak>"""
-
-    return ssml
+    return SSML_PREFIX + syllable['pinyin_tone3'] + SSML_SUFFIX
 
 
 # ============================================================================
@@ -111,20 +123,50 @@ def generate_ssml(syllable: Dict) -> str:
 # ============================================================================
 
 def synthesize_syllable(
-    syllable: Dict,
+    ssml: str,
     polly_client,
-    output_path: str
+    output_path: str,
+    audio_cache: Optional[AudioCache] = None,
+    rate_limiter: Optional[TokenBucket] = None
 ) -> Dict:
     """
-    Synthesize a single syllable using AWS Polly.
+    Synthesize a single syllable (pre-rendered SSML) using AWS Polly.
+
+    Audio found in audio_cache is written without calling Polly; fresh
+    audio is stored there after a successful request. Polly requests wait
+    for a slot from rate_limiter, cache hits do not.
 
     Returns:
-        dict with keys: status, duration_ms, file_size, error
+        dict with keys: status, duration_ms, file_size, error, cached
     """
-    try:
-        # Generate SSML
-        ssml = generate_ssml(syllable)
+    if audio_cache is not None:
+        audio_data = audio_cache.get(ssml)
+        if audio_data is not None:
+            return {
+                'status': 'success',
+                'duration_ms': 0,
+                'file_size': len(write_audio_chunks([audio_data], output_path)),
+                'error': None,
+                'ssml': ssml,
+                'cached': True,
+            }
 
+    if rate_limiter is not None:
+        rate_limiter.acquire()
+
+    result = _synthesize_syllable(ssml, polly_client, output_path, audio_cache)
+    result['cached'] = False
+    return result
+
+
+def _synthesize_syllable(
+    ssml: str,
+    polly_client,
+    output_path: str,
+    audio_cache: Optional[AudioCache] = None
+) -> Dict:
+    """Issue the Polly request for one syllable, write the OGG file and cache it."""
+    try:
         # Call AWS Polly
         response = polly_client.synthesize_speech(
             Text=ssml,
@@ -144,19 +186,20 @@ def synthesize_syllable(
                 'ssml': ssml
             }
 
-        # Read and save audio data
-        audio_data = response['AudioStream'].read()
-
-        with open(output_path, 'wb') as f:
-            f.write(audio_data)
+        # Stream audio data straight to disk
+        audio_data = write_audio_chunks(
+            response['AudioStream'].iter_chunks(AUDIO_CHUNK_SIZE),
+            output_path
+        )
 
-        # Get file stats
-        file_size = len(audio_data)
+        # Cache the bytes just written rather than reading the file back
+        if audio_cache is not None:
+            audio_cache.put(ssml, audio_data)
 
         return {
             'status': 'success',
             'duration_ms': 0,  # Not available from Polly directly
-            'file_size': file_size,
+            'file_size': len(audio_data),
             'error': None,
             'ssml': ssml
         }
@@ -167,7 +210,7 @@ def synthesize_syllable(
             'duration_ms': 0,
             'file_size': 0,
             'error': 'AWS credentials not found. Run "aws configure" or set AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY',
-            'ssml': ssml if 'ssml' in locals() else None
+            'ssml': ssml
         }
 
     except ClientError as e:
@@ -178,7 +221,7 @@ def synthesize_syllable(
             'duration_ms': 0,
             'file_size': 0,
             'error': f"AWS ClientError [{error_code}]: {error_msg}",
-            'ssml': ssml if 'ssml' in locals() else None
+            'ssml': ssml
         }
 
     except Exception as e:
@@ -187,33 +230,169 @@ def synthesize_syllable(
             'duration_ms': 0,
             'file_size': 0,
             'error': str(e),
-            'ssml': ssml if 'ssml' in locals() else None
+            'ssml': ssml
         }
 
 
+def write_audio_chunks(chunks, output_path: str) -> bytes:
+    """
+    Write audio chunks (e.g. a Polly AudioStream) to output_path as they
+    arrive.
+
+    The chunks go to a temporary .part file that is renamed over output_path
+    once complete, so a crashed run never leaves a truncated .ogg that
+    resume would mistake for a finished syllable. Files are not synced; after
+    a power loss the OS may still drop recent writes.
+
+    Returns:
+        The audio written (a syllable is a few KB), for the audio cache
+    """
+    part_path = Path(f"{output_path}.part")
+    written = []
+    try:
+        with open(part_path, 'wb') as f:
+            for chunk in chunks:
+                f.write(chunk)
+                written.append(chunk)
+        os.replace(part_path, output_path)
+    except BaseException:
+        part_path.unlink(missing_ok=True)
+        raise
+    return b''.join(written)
+
+
 # ============================================================================
 # PROGRESS TRACKING
 # ============================================================================
 
-def load_progress(progress_file: Path) -> Dict:
-    """Load progress from JSON file."""
+def load_progress(progress_file: Path, progress_log: Path) -> Dict:
+    """
+    Load the JSON progress snapshot, then replay the records appended to the
+    NDJSON progress log since the snapshot was last written.
+
+    'completed' and 'failed' are sets in memory and sorted lists on disk.
+    """
     if progress_file.exists():
         with open(progress_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    return {
-        'completed': [],
-        'failed': [],
-        'total_processed': 0,
-        'total_success': 0,
-        'total_failed': 0,
-        'total_size': 0,
-    }
+            progress = json.load(f)
+        progress['completed'] = set(progress['completed'])
+        progress['failed'] = set(progress['failed'])
+    else:
+        progress = {
+            'completed': set(),
+            'failed': set(),
+            'total_processed': 0,
+            'total_success': 0,
+            'total_failed': 0,
+            'total_size': 0,
+        }
+
+    if progress_log.exists():
+        with open(progress_log, 'rb') as f:
+            for line in f:
+                try:
+                    record = loads(line)
+                except ValueError:
+                    continue  # Torn last line from an interrupted run
+
+                # May already be in the snapshot (interrupted during
+                # compaction); each filename is only counted once
+                apply_progress_record(progress, record)
+
+    return progress
+
+
+def apply_progress_record(progress: Dict, record: Dict):
+    """
+    Fold one finished syllable into the progress totals.
+
+    Each filename is counted once. A syllable that is already completed (e.g.
+    generated again because its file went missing) changes nothing, and a
+    success for a previously failed syllable moves it from failed to
+    completed.
+    """
+    filename = record['filename']
+    if filename in progress['completed']:
+        return
+
+    if record['status'] == 'success':
+        progress['completed'].add(filename)
+        progress['total_success'] += 1
+        progress['total_size'] += record['file_size']
+        if filename in progress['failed']:
+            progress['failed'].discard(filename)
+            progress['total_failed'] -= 1
+            return  # Already counted as processed
+    elif filename in progress['failed']:
+        return
+    else:
+        progress['failed'].add(filename)
+        progress['total_failed'] += 1
+
+    progress['total_processed'] += 1
+
+
+def scan_existing_audio(output_dir: Path) -> Dict[str, int]:
+    """
+    List finished audio files and their sizes in one directory pass.
+
+    Audio is renamed into place only once fully written (unfinished .part
+    files are ignored); empty files don't count.
+
+    Returns:
+        dict of filename (without .ogg) -> size in bytes
+    """
+    with os.scandir(output_dir) as entries:
+        existing_files = {
+            entry.name[:-4]: entry.stat().st_size
+            for entry in entries if entry.name.endswith('.ogg')
+        }
+    return {name: size for name, size in existing_files.items() if size}
+
+
+def record_existing_files(
+    progress: Dict,
+    all_syllables: List[Dict],
+    existing_files: Dict[str, int]
+) -> List[str]:
+    """
+    Count files on disk that progress doesn't list as completed (e.g. copied
+    in, written before an interrupted run's last checkpoint, or recorded as
+    failed by an earlier run) as done.
+
+    Returns:
+        Filenames newly recorded as completed
+    """
+    untracked = [
+        s['filename'] for s in all_syllables
+        if s['filename'] in existing_files and s['filename'] not in progress['completed']
+    ]
+    for filename in untracked:
+        apply_progress_record(progress, {
+            'filename': filename,
+            'status': 'success',
+            'file_size': existing_files[filename],
+        })
+    return untracked
+
+
+def compact_progress(progress: Dict, progress_file: Path, progress_log):
+    """
+    Write the full progress snapshot and empty the progress log.
+    """
+    save_progress(progress, progress_file)
+    progress_log.flush()
+    progress_log.seek(0)
+    progress_log.truncate()
 
 
 def save_progress(progress: Dict, progress_file: Path):
     """Save progress to JSON file."""
-    with open(progress_file, 'w', encoding='utf-8') as f:
-        json.dump(progress, f, ensure_ascii=False, indent=2)
+    write_json(progress_file, {
+        **progress,
+        'completed': sorted(progress['completed']),
+        'failed': sorted(progress['failed']),
+    })
 
 
 # ============================================================================
@@ -252,11 +431,11 @@ def test_aws_credentials(polly_client) -> bool:
         True if credentials work, False otherwise
     """
     try:
-        # Try to list voices (minimal API call to test credentials)
-        response = polly_client.describe_voices(LanguageCode='cmn-CN')
+        # Try to list voices (minimal API call to test credentials); the
+        # listing is cached for a day so resumed runs skip the round trip
+        voices = describe_voices_cached(polly_client, OUTPUT_DIR / '.voices.json', 'cmn-CN')
 
         # Check if Zhiyu voice is available
-        voices = response.get('Voices', [])
         zhiyu_available = any(v['Id'] == 'Zhiyu' for v in voices)
 
         if not zhiyu_available:
@@ -319,7 +498,20 @@ def main():
     # 2. Initialize AWS Polly client
     print("\n[2/8] Initializing AWS Polly client...")
     try:
-        polly_client = boto3.client('polly', region_name=AWS_REGION)
+        # One client for all workers: pooled keep-alive connections amortize
+        # TLS handshakes, and adaptive retries absorb Polly throttling
+        polly_config = Config(
+            region_name=AWS_REGION,
+            max_pool_connections=max(MAX_POOL_CONNECTIONS, MAX_WORKERS),
+            retries={'mode': 'adaptive', 'max_attempts': MAX_RETRY_ATTEMPTS},
+            tcp_keepalive=True,
+            connect_timeout=CONNECT_TIMEOUT,
+            read_timeout=READ_TIMEOUT,
+            # Requests are built from fixed settings and pre-rendered SSML,
+            # so skip botocore's per-call input validation
+            parameter_validation=False,
+        )
+        polly_client = boto3.client('polly', config=polly_config)
         print("   ✓ Polly client initialized")
     except Exception as e:
         print(f"   ❌ Failed to initialize Polly client: {e}")
@@ -348,7 +540,8 @@ def main():
 
     # 6. Load progress
     progress_file = OUTPUT_DIR / 'generation_progress.json'
-    progress = load_progress(progress_file)
+    progress_log_file = OUTPUT_DIR / 'generation_progress.ndjson'
+    progress = load_progress(progress_file, progress_log_file)
     print(f"\n[6/8] Progress tracking:")
     print(f"   ✓ Previously processed: {progress['total_processed']}")
     print(f"   ✓ Previously succeeded: {progress['total_success']}")
@@ -357,16 +550,21 @@ def main():
     # 7. Determine which syllables to generate
     print(f"\n[7/8] Preparing generation...")
 
-    completed_set = set(progress['completed'])
-    failed_set = set(progress['failed'])
-
     if RESUME_FROM_EXISTING:
-        # Check for existing files on disk
-        existing_files = {f.stem for f in OUTPUT_DIR.glob('*.ogg')}
-        skip_set = completed_set | existing_files
+        # Check for existing files on disk, sizes included, in one directory pass
+        existing_files = scan_existing_audio(OUTPUT_DIR)
+
+        # Files on disk that progress doesn't know about count as done
+        untracked = record_existing_files(progress, all_syllables, existing_files)
+
+        # Only what is actually on disk is skipped; progress entries whose
+        # file went missing are generated again
+        skip_set = set(existing_files)
         to_generate = [s for s in all_syllables if s['filename'] not in skip_set]
         print(f"   ✓ Resume mode: ON")
         print(f"   ✓ Existing files: {len(existing_files)}")
+        if untracked:
+            print(f"   ✓ Recorded {len(untracked)} existing files missing from progress")
         print(f"   ✓ Skipping: {len(skip_set)} syllables")
     else:
         to_generate = all_syllables
@@ -380,6 +578,9 @@ def main():
 
     print(f"   ✓ To generate: {len(to_generate)} syllables")
 
+    # Render every request body up front, outside the request path
+    ssml_list = [generate_ssml(syllable) for syllable in to_generate]
+
     if len(to_generate) == 0:
         print("\n✓ All syllables already generated!")
         sys.exit(0)
@@ -389,11 +590,10 @@ def main():
     print("Ready to generate audio files")
     print("=" * 70)
     print(f"\nWill generate {len(to_generate)} files")
-    print(f"Estimated time: {len(to_generate) * RATE_LIMIT_DELAY / 60:.1f} minutes")
+    print(f"Estimated time: {len(to_generate) / MAX_REQUESTS_PER_SECOND / 60:.1f} minutes")
 
-    # Calculate estimated cost
-    avg_ssml_chars = 100  # rough estimate
-    total_chars = len(to_generate) * avg_ssml_chars
+    # Calculate estimated cost (Polly bills per SSML character)
+    total_chars = sum(map(len, ssml_list))
     if ENGINE == 'neural':
         cost = (total_chars / 1_000_000) * 16
         print(f"Estimated cost: ${cost:.4f} (neural voice, likely FREE with free tier)")
@@ -413,61 +613,91 @@ def main():
     print("=" * 70)
 
     start_time = time.time()
-    results = []
-
-    for i, syllable in enumerate(to_generate, 1):
-        filename = f"{syllable['filename']}.ogg"
-        output_path = OUTPUT_DIR / filename
-
-        # Show progress
-        percent = (i / len(to_generate)) * 100
-        print(f"[{i}/{len(to_generate)}] ({percent:.1f}%) {filename:15} ", end='', flush=True)
-
-        # Double-check: Skip if file already exists (in case of mid-run failure)
-        if output_path.exists():
-            file_size = output_path.stat().st_size
-            print(f"⊙ (exists, {file_size:,} bytes)")
-            progress['completed'].append(syllable['filename'])
-            progress['total_success'] += 1
-            progress['total_processed'] += 1
-            progress['total_size'] += file_size
-            results.append({
-                'syllable': syllable,
-                'status': 'skipped',
-                'file_size': file_size,
-                'error': None,
-            })
-            continue
-
-        result = synthesize_syllable(syllable, polly_client, str(output_path))
+    # Per-syllable results are streamed to disk; only counters and the
+    # failures (for the summary) stay in memory
+    results_file = OUTPUT_DIR / 'generation_results.ndjson'
+    summary_file = OUTPUT_DIR / 'generation_summary.json'
+    success_count = failed_count = 0
+    failed_results = []
+    total_to_generate = len(to_generate)
+    done = 0
+
+    def record(syllable: Dict, filename: str, result: Dict):
+        """Print one finished syllable and fold it into progress (main thread only)."""
+        nonlocal done, success_count, failed_count
+        done += 1
+        percent = (done / total_to_generate) * 100
+        print(f"[{done}/{total_to_generate}] ({percent:.1f}%) {filename:15} ", end='')
 
         if result['status'] == 'success':
-            print(f"✓ ({result['file_size']:,} bytes)")
-            progress['completed'].append(syllable['filename'])
-            progress['total_success'] += 1
-            progress['total_size'] += result['file_size']
+            cached = ", cached" if result.get('cached') else ""
+            print(f"✓ ({result['file_size']:,} bytes{cached})")
+            success_count += 1
         else:
             print(f"✗ FAILED")
             print(f"   Error: {result['error']}")
-            progress['failed'].append(syllable['filename'])
-            progress['total_failed'] += 1
+            failed_count += 1
+            failed_results.append({'syllable': syllable, **result})
 
-        progress['total_processed'] += 1
-        results.append({
-            'syllable': syllable,
-            **result
-        })
-
-        # Save progress periodically
-        if i % PROGRESS_SAVE_INTERVAL == 0:
-            save_progress(progress, progress_file)
-
-        # Rate limiting
-        if i < len(to_generate):
-            time.sleep(RATE_LIMIT_DELAY)
-
-    # Save final progress
-    save_progress(progress, progress_file)
+        progress_record = {
+            'filename': syllable['filename'],
+            'status': result['status'],
+            'file_size': result['file_size'],
+        }
+        apply_progress_record(progress, progress_record)
+        append_ndjson_record(progress_log, progress_record)
+        append_ndjson_record(results_log, {'syllable': syllable, **result})
+
+        # Rewrite the full snapshot only rarely; in between, flush the small
+        # appended records. Audio isn't synced: it is renamed into place
+        # only once fully written
+        if done % PROGRESS_COMPACT_INTERVAL == 0:
+            compact_progress(progress, progress_file, progress_log)
+        elif done % PROGRESS_SAVE_INTERVAL == 0:
+            progress_log.flush()
+
+        # Console output and results are flushed at checkpoints rather than per line
+        if done % PROGRESS_SAVE_INTERVAL == 0:
+            results_log.flush()
+            sys.stdout.flush()
+
+    audio_cache = (
+        AudioCache(AUDIO_CACHE_DB, VOICE_ID, ENGINE, OUTPUT_FORMAT) if USE_AUDIO_CACHE else None
+    )
+    rate_limiter = TokenBucket(MAX_REQUESTS_PER_SECOND)
+    progress_log = open(progress_log_file, 'ab')
+    results_log = open(results_file, 'wb')
+    # Start from an empty log so a torn line left by a crash is dropped
+    compact_progress(progress, progress_file, progress_log)
+    executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+    try:
+        futures = {}
+        for syllable, ssml in zip(to_generate, ssml_list):
+            filename = f"{syllable['filename']}.ogg"
+            output_path = OUTPUT_DIR / filename
+            future = executor.submit(
+                synthesize_syllable, ssml, polly_client, str(output_path),
+                audio_cache, rate_limiter
+            )
+            futures[future] = (syllable, filename)
+
+        for future in as_completed(futures):
+            syllable, filename = futures[future]
+            record(syllable, filename, future.result())
+
+        # Save final progress
+        compact_progress(progress, progress_file, progress_log)
+    except KeyboardInterrupt:
+        sys.stdout.flush()
+        executor.shutdown(wait=False, cancel_futures=True)
+        compact_progress(progress, progress_file, progress_log)
+        raise
+    finally:
+        executor.shutdown(wait=True)
+        progress_log.close()
+        results_log.close()
+        if audio_cache is not None:
+            audio_cache.close()
 
     elapsed_time = time.time() - start_time
 
@@ -476,11 +706,8 @@ def main():
     print("Generation Complete!")
     print("=" * 70)
 
-    success_count = sum(1 for r in results if r['status'] == 'success')
-    failed_count = sum(1 for r in results if r['status'] == 'failed')
-
     print(f"\nThis run:")
-    print(f"   Total:    {len(results)}")
+    print(f"   Total:    {done}")
     print(f"   Success:  {success_count} ✓")
     print(f"   Failed:   {failed_count} ✗")
     print(f"   Time:     {elapsed_time / 60:.1f} minutes")
@@ -498,9 +725,8 @@ def main():
     # Show failed syllables details (if any)
     if failed_count > 0:
         print(f"\n   Failed syllables in this run:")
-        for r in results:
-            if r['status'] == 'failed':
-                print(f"      - {r['syllable']['pinyin_tone3']}: {r['error']}")
+        for r in failed_results:
+            print(f"      - {r['syllable']['pinyin_tone3']}: {r['error']}")
 
     print("\n" + "=" * 70)
     if progress['total_success'] == total_syllables:
@@ -514,20 +740,20 @@ def main():
     print(f"\n✓ Generated files are in: {OUTPUT_DIR}")
     print(f"✓ Progress saved to: {progress_file}")
 
-    # Save detailed results
-    results_file = OUTPUT_DIR / 'generation_results.json'
-    with open(results_file, 'w', encoding='utf-8') as f:
-        json.dump({
-            'run_timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
-            'elapsed_time_minutes': elapsed_time / 60,
-            'results': results,
-            'summary': {
-                'total': len(results),
-                'success': success_count,
-                'failed': failed_count,
-            }
-        }, f, ensure_ascii=False, indent=2)
+    # Save run summary (per-syllable results are already in results_file)
+    write_json(summary_file, {
+        'run_timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'elapsed_time_minutes': elapsed_time / 60,
+        'results_file': results_file.name,
+        'summary': {
+            'total': done,
+            'success': success_count,
+            'failed': failed_count,
+        },
+        'failed': failed_results,
+    })
     print(f"✓ Detailed results saved to: {results_file}")
+    print(f"✓ Run summary saved to: {summary_file}")
 
 
 if __name__ == '__main__':
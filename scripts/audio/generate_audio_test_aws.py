@@ -25,13 +25,22 @@ Usage:
 import os
 import sys
 import json
+import random
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.json_io import write_json
+from common.polly_cache import AudioCache, describe_voices_cached
+from common.rate_limiter import AdaptiveConcurrencyLimiter, TokenBucket
 
 try:
     import boto3
-    from botocore.exceptions import BotoCoreError, ClientError, NoCredentialsError
+    from botocore.config import Config
+    from botocore.exceptions import ClientError, NoCredentialsError
 except ImportError:
     print("ERROR: boto3 not installed")
     print("Install with: pip install boto3")
@@ -57,16 +66,36 @@ OUTPUT_FORMAT = 'ogg_vorbis'  # OGG Vorbis (good compression)
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 INPUT_JSON = PROJECT_ROOT / 'data' / 'audio' / 'syllables_enumeration.json'
 OUTPUT_DIR = PROJECT_ROOT / 'data' / 'audio' / 'test_output_aws'
+AUDIO_CACHE_DB = PROJECT_ROOT / 'data' / 'audio' / 'polly_cache.db'  # shared with generate_audio_aws.py
 
 # Test settings
 TEST_LIMIT = 10  # Only generate first 10 syllables
-RATE_LIMIT_DELAY = 0.1  # seconds between requests
+CONCURRENCY = 5  # initial concurrent Polly requests in flight
+MAX_CONCURRENCY = 20  # ceiling for the adaptive (AIMD) concurrency limit
+MAX_QUEUED = MAX_CONCURRENCY * 2  # submitted-but-unfinished requests (backpressure)
+RATE_LIMIT_RPS = 10  # requests per second across all workers
+RATE_LIMIT_BURST = 5  # requests allowed at once before pacing kicks in
+USE_AUDIO_CACHE = True  # reuse audio for unchanged SSML/voice across runs
+MAX_ATTEMPTS = 5  # tries per syllable when Polly throttles (botocore retries are off)
+RETRY_BACKOFF_BASE = 0.2  # seconds; backoff before retry n is up to base * 2**n
+RETRY_BACKOFF_CAP = 5.0  # seconds; upper bound on a single backoff
+CONNECT_TIMEOUT = 5  # seconds to establish a connection to Polly
+READ_TIMEOUT = 30  # seconds to wait for Polly to respond
+AUDIO_CHUNK_SIZE = 64 * 1024  # bytes per read when streaming audio to disk
+
+# Error codes that mean Polly wants us to slow down
+THROTTLING_ERROR_CODES = {'ThrottlingException', 'TooManyRequestsException'}
 
 
 # ============================================================================
 # SSML GENERATION
 # ============================================================================
 
+# Use a placeholder Chinese character (phoneme will override its pronunciation)
+SSML_PLACEHOLDER = "字"
+SSML_PREFIX = '<speak><phoneme alphabet="x-amazon-pinyin" ph="'
+SSML_SUFFIX = f'">{SSML_PLACEHOLDER}</phoneme></speak>'
+
 def generate_ssml(syllable: Dict) -> str:
     """
     Generate SSML for a single syllable using AWS Polly x-amazon-pinyin.
@@ -85,17 +114,9 @@ def generate_ssml(syllable: Dict) -> str:
           Neutral tones are marked with '0' (e.g., 'a0', 'ma0').
           Our enumeration data already uses this format.
     """
-    pinyin = syllable['pinyin_tone3']  # e.g., "ma1", "lv3", "a0"
-
-    # Use a placeholder Chinese character (phoneme will override its pronunciation)
-    placeholder = "字"
-
     # AWS Polly uses our pinyin_tone3 format directly!
-    ssml = f"""<speak>
-    <phoneme alphabet="x-amazon-pinyin" ph="{pinyin}">{placeholder}</phoneme>
-</speak>"""
-
-    return ssml
+    # Single line: Polly bills every SSML character, whitespace included
+    return SSML_PREFIX + syllable['pinyin_tone3'] + SSML_SUFFIX
 
 
 # ============================================================================
@@ -103,47 +124,102 @@ def generate_ssml(syllable: Dict) -> str:
 # ============================================================================
 
 def synthesize_syllable(
-    syllable: Dict,
+    ssml: str,
     polly_client,
-    output_path: str
+    output_path: str,
+    rate_limiter: Optional[TokenBucket] = None,
+    concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+    audio_cache: Optional[AudioCache] = None
 ) -> Dict:
     """
-    Synthesize a single syllable using AWS Polly.
+    Synthesize a single syllable (pre-rendered SSML) using AWS Polly.
+
+    Audio found in audio_cache is written without calling Polly; fresh
+    audio is stored there after a successful request.
+    The concurrency limiter (if given) is told how long the request took and
+    whether Polly throttled it, so it can adjust the number in flight.
+    Throttled requests are retried here (up to MAX_ATTEMPTS, with jittered
+    exponential backoff) rather than by botocore, so the limiter sees every
+    throttle.
 
     Returns:
         dict with keys: status, duration_ms, file_size, error
     """
     try:
-        # Generate SSML
-        ssml = generate_ssml(syllable)
-
-        # Call AWS Polly
-        response = polly_client.synthesize_speech(
-            Text=ssml,
-            TextType='ssml',
-            OutputFormat=OUTPUT_FORMAT,
-            VoiceId=VOICE_ID,
-            Engine=ENGINE
-        )
-
-        # Check if we got audio stream
-        if 'AudioStream' not in response:
-            return {
-                'status': 'failed',
-                'duration_ms': 0,
-                'file_size': 0,
-                'error': 'No AudioStream in response',
-                'ssml': ssml
-            }
-
-        # Read and save audio data
-        audio_data = response['AudioStream'].read()
-
-        with open(output_path, 'wb') as f:
-            f.write(audio_data)
-
-        # Get file stats
-        file_size = len(audio_data)
+        if audio_cache is not None:
+            audio_data = audio_cache.get(ssml)
+            if audio_data is not None:
+                with open(output_path, 'wb') as f:
+                    f.write(audio_data)
+                return {
+                    'status': 'success',
+                    'duration_ms': 0,
+                    'file_size': len(audio_data),
+                    'error': None,
+                    'ssml': ssml,
+                    'cached': True
+                }
+
+        attempt = 1
+        while True:
+            # Wait for a request slot shared by all worker threads
+            if rate_limiter is not None:
+                rate_limiter.acquire()
+
+            if concurrency_limiter is not None:
+                concurrency_limiter.acquire()
+            started = time.monotonic()
+            throttled = False
+            try:
+                # Call AWS Polly
+                response = polly_client.synthesize_speech(
+                    Text=ssml,
+                    TextType='ssml',
+                    OutputFormat=OUTPUT_FORMAT,
+                    VoiceId=VOICE_ID,
+                    Engine=ENGINE
+                )
+
+                # Check if we got audio stream
+                if 'AudioStream' not in response:
+                    return {
+                        'status': 'failed',
+                        'duration_ms': 0,
+                        'file_size': 0,
+                        'error': 'No AudioStream in response',
+                        'ssml': ssml
+                    }
+
+                # Stream audio straight from the response body to disk
+                # (part of the request's round trip), keeping the chunks
+                # for the audio cache
+                chunks = []
+                try:
+                    with open(output_path, 'wb') as f:
+                        for chunk in response['AudioStream'].iter_chunks(AUDIO_CHUNK_SIZE):
+                            f.write(chunk)
+                            chunks.append(chunk)
+                except BaseException:
+                    # Don't leave a partial .ogg behind
+                    Path(output_path).unlink(missing_ok=True)
+                    raise
+                audio_data = b''.join(chunks)
+                break
+            except ClientError as e:
+                throttled = e.response.get('Error', {}).get('Code') in THROTTLING_ERROR_CODES
+                if not throttled or attempt >= MAX_ATTEMPTS:
+                    raise
+            finally:
+                if concurrency_limiter is not None:
+                    concurrency_limiter.release(time.monotonic() - started, throttled)
+
+            # Exponential backoff with full jitter, so workers throttled
+            # together don't all retry into the same window
+            time.sleep(min(RETRY_BACKOFF_CAP, RETRY_BACKOFF_BASE * 2 ** attempt) * random.random())
+            attempt += 1
+
+        if audio_cache is not None:
+            audio_cache.put(ssml, audio_data)
 
         # AWS Polly doesn't return duration directly
         # We'll need to calculate it from file or leave it as 0
@@ -152,9 +228,10 @@ def synthesize_syllable(
         return {
             'status': 'success',
             'duration_ms': 0,  # Not available from Polly directly
-            'file_size': file_size,
+            'file_size': len(audio_data),
             'error': None,
-            'ssml': ssml
+            'ssml': ssml,
+            'cached': False
         }
 
     except NoCredentialsError:
@@ -163,7 +240,7 @@ def synthesize_syllable(
             'duration_ms': 0,
             'file_size': 0,
             'error': 'AWS credentials not found. Run "aws configure" or set AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY',
-            'ssml': ssml if 'ssml' in locals() else None
+            'ssml': ssml
         }
 
     except ClientError as e:
@@ -174,7 +251,7 @@ def synthesize_syllable(
             'duration_ms': 0,
             'file_size': 0,
             'error': f"AWS ClientError [{error_code}]: {error_msg}",
-            'ssml': ssml if 'ssml' in locals() else None
+            'ssml': ssml
         }
 
     except Exception as e:
@@ -183,7 +260,7 @@ def synthesize_syllable(
             'duration_ms': 0,
             'file_size': 0,
             'error': str(e),
-            'ssml': ssml if 'ssml' in locals() else None
+            'ssml': ssml
         }
 
 
@@ -222,11 +299,11 @@ def test_aws_credentials(polly_client) -> bool:
         True if credentials work, False otherwise
     """
     try:
-        # Try to list voices (minimal API call to test credentials)
-        response = polly_client.describe_voices(LanguageCode='cmn-CN')
+        # Try to list voices (minimal API call to test credentials); the
+        # listing is cached for a day so resumed runs skip the round trip
+        voices = describe_voices_cached(polly_client, OUTPUT_DIR / '.voices.json', 'cmn-CN')
 
         # Check if Zhiyu voice is available
-        voices = response.get('Voices', [])
         zhiyu_available = any(v['Id'] == 'Zhiyu' for v in voices)
 
         if not zhiyu_available:
@@ -280,6 +357,7 @@ def select_test_syllables(all_syllables: List[Dict], limit: int) -> List[Dict]:
         List of selected syllable dicts
     """
     selected = []
+    selected_ids = set()  # filenames already picked (O(1) membership)
 
     # Manually pick diverse examples
     targets = [
@@ -295,20 +373,24 @@ def select_test_syllables(all_syllables: List[Dict], limit: int) -> List[Dict]:
         'zhong1'  # another common one
     ]
 
-    # Find these syllables in the list
+    # Find these syllables in the list (first match per pinyin)
+    by_pinyin = {}
+    for syll in all_syllables:
+        by_pinyin.setdefault(syll['pinyin_tone3'], syll)
+
     for target in targets[:limit]:
-        for syll in all_syllables:
-            if syll['pinyin_tone3'] == target:
-                selected.append(syll)
-                break
+        syll = by_pinyin.get(target)
+        if syll is not None and syll['filename'] not in selected_ids:
+            selected.append(syll)
+            selected_ids.add(syll['filename'])
 
     # If we didn't find enough, pad with first N syllables
-    while len(selected) < limit:
-        for syll in all_syllables:
-            if syll not in selected:
-                selected.append(syll)
-                if len(selected) >= limit:
-                    break
+    for syll in all_syllables:
+        if len(selected) >= limit:
+            break
+        if syll['filename'] not in selected_ids:
+            selected.append(syll)
+            selected_ids.add(syll['filename'])
 
     return selected[:limit]
 
@@ -317,6 +399,75 @@ def select_test_syllables(all_syllables: List[Dict], limit: int) -> List[Dict]:
 # MAIN TEST SCRIPT
 # ============================================================================
 
+def synthesize_syllables(
+    test_syllables: List[Dict],
+    ssml_list: List[str],
+    polly_client
+) -> List[Dict]:
+    """
+    Synthesize syllables with concurrent synthesize_speech calls, paced by a
+    token bucket so the aggregate request rate stays under Polly's quota.
+
+    The number of requests in flight starts at CONCURRENCY and adapts (AIMD):
+    +1 per healthy response up to MAX_CONCURRENCY, halved on throttling or
+    rising latency.
+    """
+    results = []
+    rate_limiter = TokenBucket(RATE_LIMIT_RPS, RATE_LIMIT_BURST)
+    concurrency_limiter = AdaptiveConcurrencyLimiter(CONCURRENCY, MAX_CONCURRENCY)
+    audio_cache = (
+        AudioCache(AUDIO_CACHE_DB, VOICE_ID, ENGINE, OUTPUT_FORMAT) if USE_AUDIO_CACHE else None
+    )
+    remaining = zip(test_syllables, ssml_list)
+    pending = {}  # future -> syllable
+
+    # boto3 clients are thread-safe, so all workers share polly_client
+    executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENCY)
+    try:
+        while True:
+            # Keep at most MAX_QUEUED requests outstanding instead of queueing
+            # the whole run up front
+            for syllable, ssml in islice(remaining, MAX_QUEUED - len(pending)):
+                output_path = str(OUTPUT_DIR / f"{syllable['filename']}.ogg")
+                future = executor.submit(
+                    synthesize_syllable, ssml, polly_client, output_path,
+                    rate_limiter, concurrency_limiter, audio_cache
+                )
+                pending[future] = syllable
+
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                syllable = pending.pop(future)
+                result = future.result()
+
+                print(f"   [{len(results) + 1}/{len(test_syllables)}] Generated {syllable['filename']}.ogg...", end=' ')
+                if result['status'] == 'success':
+                    print(f"✓ ({result['file_size']} bytes{', cached' if result['cached'] else ''})")
+                else:
+                    print(f"✗ FAILED")
+                    print(f"       Error: {result['error']}")
+                    if result.get('ssml'):
+                        print(f"       SSML: {result['ssml'][:100]}...")
+
+                results.append({
+                    'syllable': syllable,
+                    **result
+                })
+    except KeyboardInterrupt:
+        # Drop queued requests; only the few already in flight finish
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    finally:
+        executor.shutdown(wait=True)
+        if audio_cache is not None:
+            audio_cache.close()
+
+    return results
+
+
 def main():
     print("=" * 70)
     print("AWS Polly TTS Audio Generation - TEST PROTOTYPE")
@@ -335,7 +486,21 @@ def main():
     # 2. Initialize AWS Polly client
     print("\n[2/7] Initializing AWS Polly client...")
     try:
-        polly_client = boto3.client('polly', region_name=AWS_REGION)
+        # One client for all workers: a keep-alive connection per possible
+        # in-flight request amortizes TLS handshakes. Retries are off so
+        # throttling reaches the AIMD concurrency limiter
+        polly_config = Config(
+            region_name=AWS_REGION,
+            max_pool_connections=MAX_CONCURRENCY,
+            retries={'mode': 'standard', 'max_attempts': 1},
+            tcp_keepalive=True,
+            connect_timeout=CONNECT_TIMEOUT,
+            read_timeout=READ_TIMEOUT,
+            # Requests are built from fixed settings and pre-rendered SSML,
+            # so skip botocore's per-call input validation
+            parameter_validation=False,
+        )
+        polly_client = boto3.client('polly', config=polly_config)
         print("   ✓ Polly client initialized")
     except Exception as e:
         print(f"   ❌ Failed to initialize Polly client: {e}")
@@ -370,47 +535,34 @@ def main():
 
     # 7. Generate audio files
     print(f"\n[7/7] Generating {len(test_syllables)} audio files...")
-    results = []
-
-    for i, syllable in enumerate(test_syllables, 1):
-        filename = f"{syllable['filename']}.ogg"
-        output_path = str(OUTPUT_DIR / filename)
-
-        print(f"   [{i}/{len(test_syllables)}] Generating {filename}...", end=' ')
-
-        result = synthesize_syllable(syllable, polly_client, output_path)
-
-        if result['status'] == 'success':
-            print(f"✓ ({result['file_size']} bytes)")
-        else:
-            print(f"✗ FAILED")
-            print(f"       Error: {result['error']}")
-            if result.get('ssml'):
-                print(f"       SSML: {result['ssml'][:100]}...")
 
-        results.append({
-            'syllable': syllable,
-            **result
-        })
+    # Render every request body up front, outside the request path
+    ssml_list = [generate_ssml(syllable) for syllable in test_syllables]
 
-        # Rate limiting
-        if i < len(test_syllables):
-            time.sleep(RATE_LIMIT_DELAY)
+    results = synthesize_syllables(test_syllables, ssml_list, polly_client)
 
     # 8. Summary
     print("\n" + "=" * 70)
     print("Summary")
     print("=" * 70)
 
-    success_count = sum(1 for r in results if r['status'] == 'success')
-    failed_count = sum(1 for r in results if r['status'] == 'failed')
+    # Tally everything in one pass over the results
+    success_count = failed_count = total_size = total_chars = 0
+    failed_results = []
+    for r in results:
+        if r['status'] == 'success':
+            success_count += 1
+            total_size += r['file_size']
+            total_chars += len(r.get('ssml') or '')
+        elif r['status'] == 'failed':
+            failed_count += 1
+            failed_results.append(r)
 
     print(f"   Total:    {len(results)}")
     print(f"   Success:  {success_count} ✓")
     print(f"   Failed:   {failed_count} ✗")
 
     if success_count > 0:
-        total_size = sum(r['file_size'] for r in results if r['status'] == 'success')
         avg_size = total_size / success_count
         print(f"\n   Avg file size: {avg_size:.0f} bytes")
         print(f"   Total size:    {total_size:,} bytes ({total_size/1024:.1f} KB)")
@@ -418,9 +570,8 @@ def main():
     # Show failed syllables details
     if failed_count > 0:
         print(f"\n   Failed syllables:")
-        for r in results:
-            if r['status'] == 'failed':
-                print(f"      - {r['syllable']['pinyin_tone3']}: {r['error']}")
+        for r in failed_results:
+            print(f"      - {r['syllable']['pinyin_tone3']}: {r['error']}")
 
     print("\n" + "=" * 70)
     print("Test complete!")
@@ -440,13 +591,11 @@ def main():
 
     # Save detailed results to JSON
     results_file = OUTPUT_DIR / 'test_results.json'
-    with open(results_file, 'w', encoding='utf-8') as f:
-        json.dump(results, f, ensure_ascii=False, indent=2)
+    write_json(results_file, results)
     print(f"\nDetailed results saved to: {results_file}")
 
     # Show pricing estimate
     if success_count > 0:
-        total_chars = sum(len(r.get('ssml', '')) for r in results if r['status'] == 'success')
         if ENGINE == 'neural':
             cost = (total_chars / 1_000_000) * 16  # $16 per 1M chars
             print(f"\nCost estimate for this test: ${cost:.4f} (neural voice)")
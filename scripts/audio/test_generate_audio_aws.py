@@ -0,0 +1,40 @@
+"""Resume bookkeeping in generate_audio_aws.py."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip('boto3')
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import generate_audio_aws as gen
+
+
+def test_resume_with_completed_file_missing(tmp_path):
+    all_syllables = [{'filename': name} for name in ('ma1', 'ma2', 'ma3')]
+    progress = gen.load_progress(tmp_path / 'progress.json', tmp_path / 'progress.ndjson')
+    gen.apply_progress_record(progress, {'filename': 'ma1', 'status': 'success', 'file_size': 100})
+    gen.apply_progress_record(progress, {'filename': 'ma2', 'status': 'failed', 'file_size': 0})
+
+    # ma1 is completed but its file is gone; ma2 failed but is on disk now;
+    # ma3 only has an unfinished .part file
+    (tmp_path / 'ma2.ogg').write_bytes(b'x' * 50)
+    (tmp_path / 'ma3.ogg.part').write_bytes(b'x' * 10)
+
+    existing_files = gen.scan_existing_audio(tmp_path)
+    assert existing_files == {'ma2': 50}
+
+    assert gen.record_existing_files(progress, all_syllables, existing_files) == ['ma2']
+    assert progress['failed'] == set()
+    assert progress['total_failed'] == 0
+
+    to_generate = [s['filename'] for s in all_syllables if s['filename'] not in existing_files]
+    assert to_generate == ['ma1', 'ma3']
+    for filename in to_generate:
+        gen.apply_progress_record(progress, {'filename': filename, 'status': 'success', 'file_size': 100})
+
+    assert progress['completed'] == {'ma1', 'ma2', 'ma3'}
+    assert progress['total_success'] == len(all_syllables)
+    assert progress['total_processed'] == len(all_syllables)
+    assert progress['total_size'] == 250
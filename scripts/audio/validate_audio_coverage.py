@@ -12,11 +12,21 @@ The tricky part is format conversion:
 - Audio files use tone numbers: nv3.ogg, zhei4.ogg, mei3.ogg
 """
 
+import argparse
 import csv
-import json
 import os
+import re
+import sys
+from collections import defaultdict
+from functools import lru_cache
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.json_io import loads
+
+# Buffer size for the large CSV files (open() defaults to 8 KiB)
+IO_BUFFER_SIZE = 1 << 20
+
 # Tone mark mapping for conversion
 TONE_MARKS = {
     'a': ['a', 'ā', 'á', 'ǎ', 'à'],
@@ -28,6 +38,26 @@ TONE_MARKS = {
     'v': ['v', 'ǖ', 'ǘ', 'ǚ', 'ǜ'],
 }
 
+# str.translate table stripping tone marks (ü → v for audio file compatibility),
+# and tone number per marked char
+TONE_MARK_BASES = str.maketrans({
+    mark: 'v' if base_vowel == 'ü' else base_vowel
+    for base_vowel, tone_marks in TONE_MARKS.items()
+    for mark in tone_marks
+})
+TONE_MARK_TONES = {
+    mark: tone_index
+    for tone_marks in TONE_MARKS.values()
+    for tone_index, mark in enumerate(tone_marks) if tone_index > 0
+}
+TONE_MARK_PATTERN = re.compile('[' + ''.join(TONE_MARK_TONES) + ']')
+
+# Frequency annotation after a pinyin, e.g. the "(283)" in "lè(283)"
+FREQUENCY_PATTERN = re.compile(r'\(\d+\)')
+
+# The CSV repeats ~1.5k distinct pinyins across ~20k characters, so the
+# conversion is memoized
+@lru_cache(maxsize=None)
 def convert_tone_marks_to_numbers(pinyin):
     """
     Convert pinyin with tone marks to tone numbers.
@@ -36,35 +66,21 @@ def convert_tone_marks_to_numbers(pinyin):
     if not pinyin:
         return ''
 
-    result = ''
-    tone_found = 0
-
-    for char in pinyin:
-        replaced = False
-        for base_vowel, tone_marks in TONE_MARKS.items():
-            tone_index = tone_marks.index(char) if char in tone_marks else -1
-            if tone_index != -1:
-                result += base_vowel
-                if tone_index > 0:
-                    tone_found = tone_index
-                replaced = True
-                break
-
-        if not replaced:
-            result += char
-
-    # Convert ü to v for audio file compatibility
-    return (result + str(tone_found)).replace('ü', 'v')
+    # The last tone mark wins, as when scanning character by character
+    marks = TONE_MARK_PATTERN.findall(pinyin)
+    tone_found = TONE_MARK_TONES[marks[-1]] if marks else 0
 
-def strip_frequency(pinyin):
-    """
-    Strip frequency data from pinyin.
-    Example: "lè(283)" -> "lè"
-    """
-    import re
-    return re.sub(r'\(\d+\)', '', pinyin)
+    return pinyin.translate(TONE_MARK_BASES) + str(tone_found)
 
 def main():
+    parser = argparse.ArgumentParser(description='Validate audio coverage of the character set pinyins')
+    parser.add_argument(
+        '--quiet',
+        action='store_true',
+        help='Only print counts, without listing each missing item (e.g. for CI)'
+    )
+    args = parser.parse_args()
+
     # Paths
     project_root = Path(__file__).parent.parent.parent
     csv_path = project_root / 'app/public/data/character_set/chinese_characters.csv'
@@ -83,8 +99,9 @@ def main():
 
     csv_pinyins_raw = set()
     csv_pinyins_converted = set()
+    pinyin_to_chars = defaultdict(list)  # converted pinyin → characters using it
 
-    with open(csv_path, 'r', encoding='utf-8') as f:
+    with open(csv_path, 'r', encoding='utf-8', buffering=IO_BUFFER_SIZE) as f:
         reader = csv.reader(f)
         next(reader)  # Skip header
 
@@ -92,13 +109,19 @@ def main():
             if len(row) >= 4:
                 pinyins_field = row[3]  # Column 4: pinyins
 
-                # Split by pipe, strip frequency data
-                for pinyin in pinyins_field.split('|'):
-                    pinyin_clean = strip_frequency(pinyin).strip()
+                # Strip frequency data from the whole field in one pass, e.g.
+                # "lè(283)|yuè(41)" -> "lè|yuè", so the split pinyins repeat
+                # across rows and hit the conversion cache
+                row_converted = set()
+                for pinyin in FREQUENCY_PATTERN.sub('', pinyins_field).split('|'):
+                    pinyin_clean = pinyin.strip()
                     if pinyin_clean:
                         csv_pinyins_raw.add(pinyin_clean)
                         converted = convert_tone_marks_to_numbers(pinyin_clean)
                         csv_pinyins_converted.add(converted)
+                        if converted not in row_converted:
+                            row_converted.add(converted)
+                            pinyin_to_chars[converted].append(row[1])
 
     print(f"   ✓ Found {len(csv_pinyins_raw)} unique pinyins (with tone marks)")
     print(f"   ✓ Converted to {len(csv_pinyins_converted)} unique pinyins (with tone numbers)")
@@ -109,13 +132,9 @@ def main():
     # =========================================================================
     print("[2/3] Extracting syllables from syllables_enumeration.json...")
 
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = loads(json_path.read_bytes())
 
-    json_syllables = set()
-    for syllable in data['syllables']:
-        filename = syllable['filename']
-        json_syllables.add(filename)
+    json_syllables = {syllable['filename'] for syllable in data['syllables']}
 
     print(f"   ✓ Found {len(json_syllables)} syllables in enumeration")
     print()
@@ -125,10 +144,10 @@ def main():
     # =========================================================================
     print("[3/3] Checking audio files exist...")
 
-    audio_files = set()
-    for ogg_file in audio_dir.glob('*.ogg'):
+    # scandir yields names directly, without a Path object per file
+    with os.scandir(audio_dir) as entries:
         # Strip .ogg extension
-        audio_files.add(ogg_file.stem)
+        audio_files = {entry.name[:-4] for entry in entries if entry.name.endswith('.ogg')}
 
     print(f"   ✓ Found {len(audio_files)} .ogg files")
     print()
@@ -145,28 +164,17 @@ def main():
     if missing_from_json:
         print(f"❌ FAILED: {len(missing_from_json)} pinyins from CSV are missing in JSON:")
         print()
-        for pinyin in sorted(missing_from_json):
-            # Find which character(s) use this pinyin
-            chars_with_pinyin = []
-            with open(csv_path, 'r', encoding='utf-8') as f:
-                reader = csv.reader(f)
-                next(reader)
-                for row in reader:
-                    if len(row) >= 4:
-                        pinyins_field = row[3]
-                        for p in pinyins_field.split('|'):
-                            p_clean = strip_frequency(p).strip()
-                            p_converted = convert_tone_marks_to_numbers(p_clean)
-                            if p_converted == pinyin:
-                                chars_with_pinyin.append(row[1])
-                                break
-
-            chars_str = ', '.join(chars_with_pinyin[:5])
-            if len(chars_with_pinyin) > 5:
-                chars_str += f', ... ({len(chars_with_pinyin)} total)'
-
-            print(f"   - {pinyin:15s} (used by: {chars_str})")
-        print()
+        if not args.quiet:
+            for pinyin in sorted(missing_from_json):
+                # Find which character(s) use this pinyin
+                chars_with_pinyin = pinyin_to_chars[pinyin]
+
+                chars_str = ', '.join(chars_with_pinyin[:5])
+                if len(chars_with_pinyin) > 5:
+                    chars_str += f', ... ({len(chars_with_pinyin)} total)'
+
+                print(f"   - {pinyin:15s} (used by: {chars_str})")
+            print()
     else:
         print("✅ PASSED: All CSV pinyins are in JSON syllables")
         print()
@@ -183,9 +191,10 @@ def main():
     if missing_audio:
         print(f"❌ FAILED: {len(missing_audio)} syllables from JSON are missing audio files:")
         print()
-        for syllable in sorted(missing_audio):
-            print(f"   - {syllable}.ogg")
-        print()
+        if not args.quiet:
+            for syllable in sorted(missing_audio):
+                print(f"   - {syllable}.ogg")
+            print()
     else:
         print("✅ PASSED: All JSON syllables have audio files")
         print()
@@ -202,9 +211,10 @@ def main():
     if extra_audio:
         print(f"⚠️  WARNING: {len(extra_audio)} audio files not in JSON:")
         print()
-        for filename in sorted(extra_audio):
-            print(f"   - {filename}.ogg")
-        print()
+        if not args.quiet:
+            for filename in sorted(extra_audio):
+                print(f"   - {filename}.ogg")
+            print()
     else:
         print("✅ PASSED: No extra audio files")
         print()
@@ -9,12 +9,62 @@ Check that every pinyin used in the sentences corpus has:
 This is the critical validation - we only need audio for pinyins actually used in practice.
 """
 
+import argparse
 import csv
-import json
+import os
+import sys
 from pathlib import Path
 from collections import defaultdict
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.json_io import loads
+
+# Buffer size for the large CSV files (open() defaults to 8 KiB)
+IO_BUFFER_SIZE = 1 << 20
+
+# Example usages shown per reported pinyin
+USAGE_EXAMPLES = 3
+
+def collect_usage_examples(sentences_csv, pinyins):
+    """
+    Second pass over the corpus collecting the first USAGE_EXAMPLES
+    (sentence_id, char) usages of each given pinyin. Only needed for
+    reporting, so it is skipped when nothing is missing, and it stops as soon
+    as every pinyin has its examples.
+    """
+    pinyin_usage = defaultdict(list)
+    if not pinyins:
+        return pinyin_usage
+
+    with open(sentences_csv, 'r', encoding='utf-8', buffering=IO_BUFFER_SIZE) as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        id_idx = header.index('id')
+        pairs_idx = header.index('char_pinyin_pairs')
+
+        pending = set(pinyins)
+        for row in reader:
+            for pair in row[pairs_idx].split('|'):
+                char, _, pinyin = pair.partition(':')
+                if pinyin in pending:
+                    usages = pinyin_usage[pinyin]
+                    usages.append((row[id_idx], char))
+                    if len(usages) == USAGE_EXAMPLES:
+                        pending.discard(pinyin)
+            if not pending:
+                break
+
+    return pinyin_usage
+
 def main():
+    parser = argparse.ArgumentParser(description='Validate audio coverage of the pinyins used in the sentences corpus')
+    parser.add_argument(
+        '--quiet',
+        action='store_true',
+        help='Only print counts, without listing each missing item (e.g. for CI)'
+    )
+    args = parser.parse_args()
+
     project_root = Path(__file__).parent.parent.parent
     sentences_csv = project_root / 'data/sentences/cmn_sentences_with_char_pinyin_and_translation_and_hsk.csv'
     json_path = project_root / 'data/audio/syllables_enumeration.json'
@@ -30,23 +80,25 @@ def main():
     # =========================================================================
     print("[1/3] Extracting pinyins from sentences corpus...")
 
-    sentence_pinyins = set()
-    pinyin_usage = defaultdict(list)  # Track which sentences use each pinyin
+    # The corpus repeats a few thousand distinct "char:pinyin" tokens millions
+    # of times, so collect raw tokens first and parse each distinct one once
+    distinct_pairs = set()
+    distinct_pairs_update = distinct_pairs.update
 
-    with open(sentences_csv, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
+    with open(sentences_csv, 'r', encoding='utf-8', buffering=IO_BUFFER_SIZE) as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        pairs_idx = header.index('char_pinyin_pairs')
 
         for row in reader:
-            sentence_id = row['id']
-            char_pinyin_pairs = row['char_pinyin_pairs']
+            distinct_pairs_update(row[pairs_idx].split('|'))
 
-            # Parse char:pinyin|char:pinyin format
-            for pair in char_pinyin_pairs.split('|'):
-                if ':' in pair:
-                    char, pinyin = pair.split(':', 1)
-                    if pinyin:  # Skip empty pinyins (punctuation)
-                        sentence_pinyins.add(pinyin)
-                        pinyin_usage[pinyin].append((sentence_id, char))
+    sentence_pinyins = set()
+    for pair in distinct_pairs:
+        # Parse char:pinyin format
+        _, sep, pinyin = pair.partition(':')
+        if sep and pinyin:  # Skip empty pinyins (punctuation)
+            sentence_pinyins.add(pinyin)
 
     print(f"   ✓ Found {len(sentence_pinyins)} unique pinyins in sentences")
     print()
@@ -56,12 +108,9 @@ def main():
     # =========================================================================
     print("[2/3] Loading syllables from enumeration...")
 
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = loads(json_path.read_bytes())
 
-    json_syllables = set()
-    for syllable in data['syllables']:
-        json_syllables.add(syllable['filename'])
+    json_syllables = {syllable['filename'] for syllable in data['syllables']}
 
     print(f"   ✓ Found {len(json_syllables)} syllables in enumeration")
     print()
@@ -71,13 +120,22 @@ def main():
     # =========================================================================
     print("[3/3] Checking audio files...")
 
-    audio_files = set()
-    for ogg_file in audio_dir.glob('*.ogg'):
-        audio_files.add(ogg_file.stem)
+    # scandir yields names directly, without a Path object per file
+    with os.scandir(audio_dir) as entries:
+        audio_files = {entry.name[:-4] for entry in entries if entry.name.endswith('.ogg')}
 
     print(f"   ✓ Found {len(audio_files)} .ogg files")
     print()
 
+    missing_from_json = sentence_pinyins - json_syllables
+    missing_audio = sentence_pinyins - audio_files
+
+    # Track which sentences use each pinyin that is about to be reported
+    if args.quiet:
+        pinyin_usage = {}
+    else:
+        pinyin_usage = collect_usage_examples(sentences_csv, missing_from_json | missing_audio)
+
     # =========================================================================
     # Validation 1: Sentences pinyins → JSON syllables
     # =========================================================================
@@ -85,19 +143,18 @@ def main():
     print("Validation 1: Sentence pinyins → JSON syllables")
     print("=" * 80)
 
-    missing_from_json = sentence_pinyins - json_syllables
-
     if missing_from_json:
         print(f"❌ FAILED: {len(missing_from_json)} pinyins from sentences are missing in JSON:")
         print()
-        for pinyin in sorted(missing_from_json)[:20]:  # Show first 20
-            examples = pinyin_usage[pinyin][:3]
-            example_str = ', '.join([f"'{char}' (ID {sid})" for sid, char in examples])
-            print(f"   - {pinyin:15s} (used by: {example_str})")
-
-        if len(missing_from_json) > 20:
-            print(f"   ... and {len(missing_from_json) - 20} more")
-        print()
+        if not args.quiet:
+            for pinyin in sorted(missing_from_json)[:20]:  # Show first 20
+                examples = pinyin_usage[pinyin]
+                example_str = ', '.join([f"'{char}' (ID {sid})" for sid, char in examples])
+                print(f"   - {pinyin:15s} (used by: {example_str})")
+
+            if len(missing_from_json) > 20:
+                print(f"   ... and {len(missing_from_json) - 20} more")
+            print()
     else:
         print("✅ PASSED: All sentence pinyins are in JSON syllables")
         print()
@@ -109,19 +166,18 @@ def main():
     print("Validation 2: Sentence pinyins → Audio files")
     print("=" * 80)
 
-    missing_audio = sentence_pinyins - audio_files
-
     if missing_audio:
         print(f"❌ FAILED: {len(missing_audio)} pinyins from sentences are missing audio files:")
         print()
-        for pinyin in sorted(missing_audio)[:20]:
-            examples = pinyin_usage[pinyin][:3]
-            example_str = ', '.join([f"'{char}' (ID {sid})" for sid, char in examples])
-            print(f"   - {pinyin}.ogg (used by: {example_str})")
-
-        if len(missing_audio) > 20:
-            print(f"   ... and {len(missing_audio) - 20} more")
-        print()
+        if not args.quiet:
+            for pinyin in sorted(missing_audio)[:20]:
+                examples = pinyin_usage[pinyin]
+                example_str = ', '.join([f"'{char}' (ID {sid})" for sid, char in examples])
+                print(f"   - {pinyin}.ogg (used by: {example_str})")
+
+            if len(missing_audio) > 20:
+                print(f"   ... and {len(missing_audio) - 20} more")
+            print()
     else:
         print("✅ PASSED: All sentence pinyins have audio files")
         print()
@@ -143,7 +199,7 @@ def main():
 
     # Coverage percentage
     if sentence_pinyins:
-        coverage = (len(sentence_pinyins - missing_audio) / len(sentence_pinyins)) * 100
+        coverage = ((len(sentence_pinyins) - len(missing_audio)) / len(sentence_pinyins)) * 100
         print(f"Coverage:           {coverage:.2f}%")
         print()
 
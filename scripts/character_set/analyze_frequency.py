@@ -3,61 +3,122 @@
 Analyze character frequency from Tatoeba sentences and add to dataset.
 Also generates statistics and distribution graphs.
 """
-import csv
-import re
-from collections import Counter
+import os
+import sys
+import zipfile
+from pathlib import Path
 import matplotlib.pyplot as plt
 import matplotlib
 matplotlib.use('Agg')  # Non-interactive backend
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.plotting import axes_pixel_columns, decimate_monotonic
+
+# CJK Unified Ideographs (our character set range)
+CJK_START = 0x4E00
+CJK_END = 0x9FFF
+
+# Character counts from the last scan, stored next to the corpus and keyed
+# by its size and mtime (and COUNTS_CACHE_VERSION, bumped when what the scan
+# counts changes)
+COUNTS_CACHE_FILENAME = '.char_counts_cache.npz'
+COUNTS_CACHE_VERSION = 3
+
+PLOT_DPI = 150
 
 
 def extract_chinese_characters(text):
     """
-    Extract only Chinese characters from text.
+    Extract only Chinese characters from text, as an array of code points.
     Filters out punctuation, numbers, Latin characters, etc.
     """
-    # Match CJK Unified Ideographs (our character set range)
-    chinese_chars = re.findall(r'[\u4e00-\u9fff]', text)
-    return chinese_chars
-
-
-def parse_tatoeba_sentences(file_path='../../data/sentences/cmn_sentences.tsv'):
+    # UTF-32 gives one fixed-width code point per character, so the range
+    # check runs vectorized over the whole text
+    codepoints = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+    return codepoints[(codepoints >= CJK_START) & (codepoints <= CJK_END)]
+
+
+def load_counts_cache(cache_path, cache_key):
+    """Load (sentence count, char counts) from a previous scan, if still valid."""
+    try:
+        with np.load(cache_path) as cached:
+            if cached['key'].tolist() == list(cache_key):
+                return int(cached['sentences']), cached['counts']
+    except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile):
+        pass
+    return None
+
+
+def save_counts_cache(cache_path, cache_key, total_sentences, char_counts):
+    """Persist the scan results for the next run."""
+    try:
+        with open(cache_path, 'wb') as f:
+            np.savez(f, key=np.array(cache_key, dtype=np.int64),
+                     sentences=total_sentences, counts=char_counts)
+    except OSError:
+        pass  # Cache is best-effort (e.g., read-only data directory)
+
+
+def scan_corpus(file_path):
     """
-    Parse Tatoeba sentences and count character frequency.
+    Count sentences and the Chinese characters in them.
 
     Returns:
-        Counter mapping character -> frequency count
+        (sentence count, array of frequency counts indexed by code point - CJK_START)
     """
-    char_counter = Counter()
-    total_sentences = 0
-
-    print(f"Parsing {file_path}...")
-
+    sentences = []
     with open(file_path, 'r', encoding='utf-8') as f:
         for line in f:
             parts = line.strip().split('\t')
             if len(parts) < 3:
                 continue
 
-            sentence = parts[2]  # Third column is the sentence
+            sentences.append(parts[2])
+            if len(sentences) % 10000 == 0:
+                print(f"  Processed {len(sentences):,} sentences...")
 
-            # Extract Chinese characters
-            chars = extract_chinese_characters(sentence)
-            char_counter.update(chars)
+    # Histogram Chinese characters over the dense CJK range in one pass
+    char_counts = np.bincount(extract_chinese_characters(''.join(sentences)) - CJK_START,
+                              minlength=CJK_END - CJK_START + 1)
+    return len(sentences), char_counts
 
-            total_sentences += 1
 
-            if total_sentences % 10000 == 0:
-                print(f"  Processed {total_sentences:,} sentences...")
+def parse_tatoeba_sentences(file_path='../../data/sentences/cmn_sentences.tsv'):
+    """
+    Parse Tatoeba sentences and count character frequency.
+
+    Only the sentence column of lines with at least three tab-separated
+    fields (id, lang, sentence) is counted.
+    The result is cached next to the file, so re-runs on an unchanged corpus
+    skip the scan.
+
+    Returns:
+        Array of frequency counts indexed by code point - CJK_START
+    """
+    print(f"Parsing {file_path}...")
+
+    st = os.stat(file_path)
+    cache_path = os.path.join(os.path.dirname(file_path), COUNTS_CACHE_FILENAME)
+    cache_key = (COUNTS_CACHE_VERSION, st.st_size, st.st_mtime_ns)
+
+    cached = load_counts_cache(cache_path, cache_key)
+    if cached is not None:
+        print(f"  Reusing counts cached in {COUNTS_CACHE_FILENAME}")
+        total_sentences, char_counts = cached
+    else:
+        total_sentences, char_counts = scan_corpus(file_path)
+        save_counts_cache(cache_path, cache_key, total_sentences, char_counts)
 
     print(f"\n✓ Processed {total_sentences:,} sentences")
-    print(f"  Unique characters found: {len(char_counter):,}")
-    print(f"  Total character occurrences: {sum(char_counter.values()):,}")
+    print(f"  Unique characters found: {np.count_nonzero(char_counts):,}")
+    print(f"  Total character occurrences: {int(char_counts.sum()):,}")
 
-    return char_counter
+    return char_counts
 
 
-def add_frequency_to_csv(char_counter,
+def add_frequency_to_csv(char_counts,
                          input_csv='../../data/chinese_characters.csv',
                          output_csv='../../data/chinese_characters_with_freq.csv'):
     """
@@ -65,40 +126,33 @@ def add_frequency_to_csv(char_counter,
     """
     print(f"\nReading {input_csv}...")
 
-    with open(input_csv, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        rows = list(reader)
+    # Keep every field as the literal string from the file (no NaN for blanks)
+    df = pd.read_csv(input_csv, dtype=str, keep_default_na=False)
 
-    # Add frequency column
-    has_freq = 0
-    no_freq = 0
+    # Add frequency column (characters outside the CJK range, and blank or
+    # multi-character entries, get 0)
+    single = (df['char'].str.len() == 1).to_numpy()
+    codepoints = np.zeros(len(df), dtype=np.int64)
+    codepoints[single] = df.loc[single, 'char'].map(ord).to_numpy()
+    in_range = (codepoints >= CJK_START) & (codepoints <= CJK_END)
+    offsets = np.clip(codepoints - CJK_START, 0, CJK_END - CJK_START)
+    df['freq'] = np.where(in_range, char_counts[offsets], 0)
 
-    for row in rows:
-        char = row['char']
-        freq = char_counter.get(char, 0)
-        row['freq'] = freq
+    has_freq = int((df['freq'] > 0).sum())
+    no_freq = len(df) - has_freq
 
-        if freq > 0:
-            has_freq += 1
-        else:
-            no_freq += 1
-
-    # Write output CSV with new column
-    fieldnames = list(rows[0].keys())  # Preserve existing column order + freq
-
-    with open(output_csv, 'w', encoding='utf-8', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(rows)
+    # Write output CSV with new column (existing column order + freq), with
+    # the same \r\n row endings as the csv module
+    df.to_csv(output_csv, index=False, lineterminator='\r\n')
 
     print(f"\n✓ Created {output_csv}")
-    print(f"  Characters with frequency > 0: {has_freq:,} ({has_freq/len(rows)*100:.1f}%)")
-    print(f"  Characters with frequency = 0: {no_freq:,} ({no_freq/len(rows)*100:.1f}%)")
+    print(f"  Characters with frequency > 0: {has_freq:,} ({has_freq/len(df)*100:.1f}%)")
+    print(f"  Characters with frequency = 0: {no_freq:,} ({no_freq/len(df)*100:.1f}%)")
 
-    return rows
+    return df
 
 
-def generate_statistics(rows):
+def generate_statistics(df):
     """
     Generate detailed frequency statistics.
     """
@@ -106,8 +160,9 @@ def generate_statistics(rows):
     print("FREQUENCY STATISTICS")
     print(f"{'='*60}\n")
 
-    freqs = [int(row['freq']) for row in rows]
-    non_zero_freqs = [f for f in freqs if f > 0]
+    # One int64 array up front; every statistic below is computed from it
+    freqs = df['freq'].to_numpy(dtype=np.int64)
+    non_zero_freqs = freqs[freqs > 0]
 
     total_chars = len(freqs)
     chars_in_corpus = len(non_zero_freqs)
@@ -117,20 +172,24 @@ def generate_statistics(rows):
     print(f"Characters appearing in corpus: {chars_in_corpus:,} ({chars_in_corpus/total_chars*100:.1f}%)")
     print(f"Characters NOT in corpus: {chars_not_in_corpus:,} ({chars_not_in_corpus/total_chars*100:.1f}%)")
 
-    if non_zero_freqs:
+    if chars_in_corpus:
+        # Sort once (descending); median, percentiles, coverage and the top 20 all read from it
+        sorted_freqs = np.sort(non_zero_freqs)[::-1]
+        n = len(sorted_freqs)
+
         print(f"\nFrequency statistics (non-zero only):")
-        print(f"  Min frequency: {min(non_zero_freqs):,}")
-        print(f"  Max frequency: {max(non_zero_freqs):,}")
-        print(f"  Mean frequency: {sum(non_zero_freqs)/len(non_zero_freqs):.1f}")
-        print(f"  Median frequency: {sorted(non_zero_freqs)[len(non_zero_freqs)//2]:,}")
+        print(f"  Min frequency: {sorted_freqs[-1]:,}")
+        print(f"  Max frequency: {sorted_freqs[0]:,}")
+        print(f"  Mean frequency: {int(sorted_freqs.sum())/n:.1f}")
+        # Upper median: ascending index n // 2, counted from the end of the descending sort
+        print(f"  Median frequency: {sorted_freqs[n - 1 - n // 2]:,}")
 
         # Percentiles
-        sorted_freqs = sorted(non_zero_freqs, reverse=True)
-        p50 = sorted_freqs[int(len(sorted_freqs) * 0.5)]
-        p75 = sorted_freqs[int(len(sorted_freqs) * 0.75)]
-        p90 = sorted_freqs[int(len(sorted_freqs) * 0.90)]
-        p95 = sorted_freqs[int(len(sorted_freqs) * 0.95)]
-        p99 = sorted_freqs[int(len(sorted_freqs) * 0.99)]
+        p50 = sorted_freqs[int(n * 0.5)]
+        p75 = sorted_freqs[int(n * 0.75)]
+        p90 = sorted_freqs[int(n * 0.90)]
+        p95 = sorted_freqs[int(n * 0.95)]
+        p99 = sorted_freqs[int(n * 0.99)]
 
         print(f"\nFrequency percentiles:")
         print(f"  Top 50% threshold: {p50:,}")
@@ -139,21 +198,28 @@ def generate_statistics(rows):
         print(f"  Top 95% threshold: {p95:,}")
         print(f"  Top 99% threshold: {p99:,}")
 
-        # Coverage analysis
-        total_occurrences = sum(non_zero_freqs)
-        cumulative = 0
-        for threshold in [100, 500, 1000, 2000, 3000, 5000]:
-            count = sum(1 for f in sorted_freqs if f >= threshold)
-            coverage = sum(f for f in sorted_freqs if f >= threshold)
+        # Coverage analysis: occurrences covered by the top N chars is cumfreq[N - 1]
+        cumfreq = np.cumsum(sorted_freqs)
+        total_occurrences = int(cumfreq[-1])
+        thresholds = [100, 500, 1000, 2000, 3000, 5000]
+
+        # sorted_freqs is descending, so negated it is ascending and the number
+        # of chars appearing ≥threshold times is a binary search away
+        counts = np.searchsorted(-sorted_freqs, [-t for t in thresholds], side='right')
+
+        for threshold, count in zip(thresholds, counts.tolist()):
             if count > 0:
+                coverage = int(cumfreq[count - 1])
                 print(f"  {count:,} chars appear ≥{threshold:,} times (cover {coverage/total_occurrences*100:.1f}% of text)")
 
-        # Top 20 most frequent
-        char_freq_pairs = [(row['char'], int(row['freq'])) for row in rows if int(row['freq']) > 0]
-        char_freq_pairs.sort(key=lambda x: x[1], reverse=True)
+        # Top 20 most frequent: only characters at least as frequent as the
+        # 20th need ranking (stable sort, so ties keep their CSV order)
+        top_n = min(20, n)
+        candidates = np.flatnonzero(freqs >= sorted_freqs[top_n - 1])
+        top = candidates[np.argsort(-freqs[candidates], kind='stable')[:top_n]]
 
         print(f"\nTop 20 most frequent characters:")
-        for i, (char, freq) in enumerate(char_freq_pairs[:20], 1):
+        for i, (char, freq) in enumerate(zip(df['char'].to_numpy()[top], freqs[top].tolist()), 1):
             print(f"  {i:2d}. {char} - {freq:,} occurrences")
 
     print(f"\n{'='*60}")
@@ -161,7 +227,7 @@ def generate_statistics(rows):
     return freqs
 
 
-def plot_frequency_distribution(rows, output_file='../../data/character_set/frequency_distribution.png'):
+def plot_frequency_distribution(df, output_file='../../data/character_set/frequency_distribution.png'):
     """
     Generate distribution graphs.
     Creates two plots:
@@ -170,24 +236,26 @@ def plot_frequency_distribution(rows, output_file='../../data/character_set/freq
     """
     print(f"\nGenerating frequency distribution graphs...")
 
-    freqs = [int(row['freq']) for row in rows]
+    freqs = df['freq'].tolist()
     non_zero_freqs = [f for f in freqs if f > 0]
     zero_count = len(freqs) - len(non_zero_freqs)
 
     # Sort by frequency
     sorted_freqs = sorted(non_zero_freqs, reverse=True)
 
-    # Create figure with 2 subplots
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 5))
+    # Create figure with 2 subplots (constrained layout is solved once, at save time)
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 5), layout='constrained')
 
     # Add main title
     total_chars = len(freqs)
     corpus_chars = len(sorted_freqs)
     fig.suptitle('Character Frequency Distribution in Sentence Corpus',
-                 fontsize=14, fontweight='bold', y=0.98)
+                 fontsize=14, fontweight='bold')
 
     # Plot 1: Full distribution (log scale)
-    ax1.plot(range(1, len(sorted_freqs) + 1), sorted_freqs, linewidth=2, color='#3b82f6')
+    # Both curves are monotonic and have more points than pixel columns; keep
+    # each column's extremes
+    ax1.plot(*decimate_monotonic(sorted_freqs, axes_pixel_columns(ax1, PLOT_DPI)), linewidth=2, color='#3b82f6')
     ax1.set_xlabel('Character Rank (by frequency)', fontsize=11)
     ax1.set_ylabel('Frequency (log scale)', fontsize=11)
     ax1.set_title(f'Full Distribution (Zipf\'s Law)\n{corpus_chars:,} characters in corpus',
@@ -203,7 +271,7 @@ def plot_frequency_distribution(rows, output_file='../../data/character_set/freq
 
     # Plot 2: Head distribution (top 2000 characters)
     top_n = min(2000, len(sorted_freqs))
-    ax2.plot(range(1, top_n + 1), sorted_freqs[:top_n], linewidth=2, color='#10b981')
+    ax2.plot(*decimate_monotonic(sorted_freqs[:top_n], axes_pixel_columns(ax2, PLOT_DPI)), linewidth=2, color='#10b981')
     ax2.set_xlabel('Character Rank (by frequency)', fontsize=11)
     ax2.set_ylabel('Frequency (linear scale)', fontsize=11)
     ax2.set_title(f'Top {top_n:,} Most Common Characters\nShows steep decline in frequency (80/20 rule)',
@@ -226,8 +294,8 @@ def plot_frequency_distribution(rows, output_file='../../data/character_set/freq
              transform=ax2.transAxes, fontsize=9, verticalalignment='top', horizontalalignment='right',
              bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5))
 
-    plt.tight_layout()
-    plt.savefig(output_file, dpi=150, bbox_inches='tight')
+    # zlib level 1: much faster to encode than the default, slightly larger file
+    plt.savefig(output_file, dpi=PLOT_DPI, pil_kwargs={'compress_level': 1})
     print(f"✓ Saved distribution graph to {output_file}")
 
     plt.close()
@@ -235,15 +303,15 @@ def plot_frequency_distribution(rows, output_file='../../data/character_set/freq
 
 if __name__ == '__main__':
     # Step 1: Count character frequency from Tatoeba
-    char_counter = parse_tatoeba_sentences()
+    char_counts = parse_tatoeba_sentences()
 
     # Step 2: Add frequency to CSV
-    rows = add_frequency_to_csv(char_counter)
+    df = add_frequency_to_csv(char_counts)
 
     # Step 3: Generate statistics
-    generate_statistics(rows)
+    generate_statistics(df)
 
     # Step 4: Plot distribution
-    plot_frequency_distribution(rows)
+    plot_frequency_distribution(df)
 
     print("\n✓ Analysis complete!")
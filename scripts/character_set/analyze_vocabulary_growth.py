@@ -6,10 +6,12 @@ Uses official HSK 3.0 character counts (fixed numbers, not analyzed from data).
 
 Outputs:
 - vocabulary_growth_by_hsk.png
+- vocabulary_growth_by_hsk.png.hash (inputs of the last render; an unchanged
+  chart is not redrawn)
 """
-import matplotlib.pyplot as plt
-import matplotlib
-matplotlib.use('Agg')  # Non-interactive backend
+import hashlib
+import json
+import os
 
 
 def get_official_hsk_counts():
@@ -34,9 +36,38 @@ def get_official_hsk_counts():
     return growth_data
 
 
+def chart_hash(growth_data):
+    """Hash of everything the chart depends on: the data and this script."""
+    h = hashlib.blake2b(json.dumps(growth_data, sort_keys=True).encode('utf-8'))
+    with open(__file__, 'rb') as f:
+        h.update(f.read())
+    return h.hexdigest()
+
+
 def plot_vocabulary_growth(growth_data,
                           output_file='../../data/character_set/vocabulary_growth_by_hsk.png'):
-    """Generate vocabulary growth visualization."""
+    """
+    Generate vocabulary growth visualization.
+
+    Skipped (without importing matplotlib) when the chart on disk was rendered
+    from the same data by the same script.
+    """
+    hash_file = output_file + '.hash'
+    current_hash = chart_hash(growth_data)
+    try:
+        with open(hash_file, 'r', encoding='utf-8') as f:
+            unchanged = f.read().strip() == current_hash and os.path.exists(output_file)
+    except OSError:
+        unchanged = False
+
+    if unchanged:
+        print(f"\n✓ Vocabulary growth chart is up to date (cached): {output_file}")
+        return
+
+    import matplotlib
+    matplotlib.use('Agg')  # Non-interactive backend
+    import matplotlib.pyplot as plt
+
     print(f"\nGenerating vocabulary growth chart...")
 
     levels = [d['level'] for d in growth_data]
@@ -122,6 +153,9 @@ def plot_vocabulary_growth(growth_data,
     print(f"✓ Saved vocabulary growth chart to {output_file}")
     plt.close()
 
+    with open(hash_file, 'w', encoding='utf-8') as f:
+        f.write(current_hash + '\n')
+
 
 if __name__ == '__main__':
     # Get official HSK counts
@@ -10,33 +10,34 @@ def build_base_csv(output_file='../../data/build_artifacts/step1_base.csv'):
     """
     Create CSV with integer id, character, and codepoint.
     """
-    records = []
+    first_record = last_record = None
+    total = 0
 
-    # CJK Unified Ideographs range
-    for code in range(0x4E00, 0x9FFF + 1):
-        char = chr(code)
-        codepoint = f"U+{code:04X}"
+    # Write each row as it is produced
+    with open(output_file, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['id', 'char', 'codepoint'])
 
-        # Sequential integer ID starting from 1
-        char_id = code - 0x4E00 + 1
+        # CJK Unified Ideographs range
+        for code in range(0x4E00, 0x9FFF + 1):
+            char = chr(code)
+            codepoint = f"U+{code:04X}"
 
-        records.append({
-            'id': char_id,
-            'char': char,
-            'codepoint': codepoint
-        })
+            # Sequential integer ID starting from 1
+            char_id = code - 0x4E00 + 1
 
-    # Write to CSV
-    with open(output_file, 'w', encoding='utf-8', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=['id', 'char', 'codepoint'])
-        writer.writeheader()
-        writer.writerows(records)
+            last_record = (char_id, char, codepoint)
+            writer.writerow(last_record)
+
+            if first_record is None:
+                first_record = last_record
+            total += 1
 
     print(f"✓ Created {output_file}")
-    print(f"  Total characters: {len(records)}")
+    print(f"  Total characters: {total}")
     print(f"  Range: U+4E00 to U+9FFF")
-    print(f"  First char: {records[0]['char']} ({records[0]['codepoint']})")
-    print(f"  Last char: {records[-1]['char']} ({records[-1]['codepoint']})")
+    print(f"  First char: {first_record[1]} ({first_record[2]})")
+    print(f"  Last char: {last_record[1]} ({last_record[2]})")
 
 
 if __name__ == '__main__':
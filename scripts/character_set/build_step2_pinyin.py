@@ -10,7 +10,50 @@ Data sources (in priority order):
 """
 import csv
 import re
-from collections import defaultdict
+
+READING_FIELDS = ('kMandarin', 'kHanyuPinyin', 'kHanyuPinlu')
+
+# kHanyuPinlu entry: pinyin(frequency)
+PINLU_PATTERN = re.compile(r'(\w+)\((\d+)\)')
+
+
+def select_pinyins(fields):
+    """
+    Pick one codepoint's pinyins (and frequencies, if known) from its
+    Unihan reading fields, by source priority.
+
+    Returns:
+        (pinyins, freqs) lists; freqs is empty without kHanyuPinlu data
+    """
+    pinyins = []
+    freqs = []
+
+    # Priority 1: kHanyuPinlu (has frequency data)
+    if 'kHanyuPinlu' in fields:
+        # Format: "lè(283) yuè(54)" or "yī(32747)"
+        pinlu_value = fields['kHanyuPinlu']
+        # Match pattern: pinyin(frequency)
+        matches = PINLU_PATTERN.findall(pinlu_value)
+        if matches:
+            pinyins = [match[0] for match in matches]
+            freqs = [int(match[1]) for match in matches]
+
+    # Priority 2: kHanyuPinyin (multiple readings, no frequency)
+    elif 'kHanyuPinyin' in fields:
+        # Format: "10263.070:dān,qiú" (has location prefix)
+        hanyu_value = fields['kHanyuPinyin']
+        # Extract part after colon
+        if ':' in hanyu_value:
+            pinyin_part = hanyu_value.split(':')[1]
+            pinyins = pinyin_part.split(',')
+
+    # Priority 3: kMandarin (single reading)
+    elif 'kMandarin' in fields:
+        # Format: "lè" or "lè yuè" (space-separated if multiple)
+        mandarin_value = fields['kMandarin']
+        pinyins = mandarin_value.split()
+
+    return pinyins, freqs
 
 
 def parse_unihan_readings(file_path='../../data/sources/Unihan_Readings.txt'):
@@ -25,8 +68,18 @@ def parse_unihan_readings(file_path='../../data/sources/Unihan_Readings.txt'):
     """
     readings = {}
 
-    # First pass: collect all reading fields for each codepoint
-    temp_data = defaultdict(dict)
+    def flush(codepoint, fields):
+        pinyins, freqs = select_pinyins(fields)
+        if pinyins:
+            readings[codepoint] = {
+                'pinyins': pinyins,
+                'freqs': freqs
+            }
+
+    # Unihan files list each codepoint's fields on consecutive lines, so a
+    # codepoint's readings are resolved as soon as the next codepoint starts
+    current_codepoint = None
+    fields = {}
 
     with open(file_path, 'r', encoding='utf-8') as f:
         for line in f:
@@ -40,44 +93,16 @@ def parse_unihan_readings(file_path='../../data/sources/Unihan_Readings.txt'):
 
             codepoint, field, value = parts[0], parts[1], parts[2]
 
-            if field in ['kMandarin', 'kHanyuPinyin', 'kHanyuPinlu']:
-                temp_data[codepoint][field] = value
-
-    # Second pass: extract pinyins and frequencies
-    for codepoint, fields in temp_data.items():
-        pinyins = []
-        freqs = []
-
-        # Priority 1: kHanyuPinlu (has frequency data)
-        if 'kHanyuPinlu' in fields:
-            # Format: "lè(283) yuè(54)" or "yī(32747)"
-            pinlu_value = fields['kHanyuPinlu']
-            # Match pattern: pinyin(frequency)
-            matches = re.findall(r'(\w+)\((\d+)\)', pinlu_value)
-            if matches:
-                pinyins = [match[0] for match in matches]
-                freqs = [int(match[1]) for match in matches]
-
-        # Priority 2: kHanyuPinyin (multiple readings, no frequency)
-        elif 'kHanyuPinyin' in fields:
-            # Format: "10263.070:dān,qiú" (has location prefix)
-            hanyu_value = fields['kHanyuPinyin']
-            # Extract part after colon
-            if ':' in hanyu_value:
-                pinyin_part = hanyu_value.split(':')[1]
-                pinyins = pinyin_part.split(',')
-
-        # Priority 3: kMandarin (single reading)
-        elif 'kMandarin' in fields:
-            # Format: "lè" or "lè yuè" (space-separated if multiple)
-            mandarin_value = fields['kMandarin']
-            pinyins = mandarin_value.split()
+            if field in READING_FIELDS:
+                if codepoint != current_codepoint:
+                    if fields:
+                        flush(current_codepoint, fields)
+                    current_codepoint = codepoint
+                    fields = {}
+                fields[field] = value
 
-        if pinyins:
-            readings[codepoint] = {
-                'pinyins': pinyins,
-                'freqs': freqs if freqs else []
-            }
+    if fields:
+        flush(current_codepoint, fields)
 
     return readings
 
@@ -93,66 +118,73 @@ def add_pinyin_to_csv(input_csv='../../data/build_artifacts/step1_base.csv',
 
     print(f"Loaded readings for {len(readings)} characters")
 
-    # Read input CSV
-    with open(input_csv, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        rows = list(reader)
+    fieldnames = ['id', 'char', 'codepoint', 'pinyins']
 
     # Add pinyin column
+    total = 0
     missing_count = 0
     multi_pinyin_count = 0
     has_freq_count = 0
+    example_rows = []  # Up to 10 characters with pinyin from the first 500 rows
+
+    # Stream rows from input to output, one at a time
+    with open(input_csv, 'r', encoding='utf-8') as f_in, \
+         open(output_csv, 'w', encoding='utf-8', newline='') as f_out:
+        reader = csv.reader(f_in)
+        header = next(reader)
+        # Input columns carried over, in output order
+        keep_cols = [header.index(name) for name in fieldnames[:-1]]
+        char_col = header.index('char')
+        codepoint_col = header.index('codepoint')
+
+        writer = csv.writer(f_out)
+        writer.writerow(fieldnames)
+
+        for row in reader:
+            if not row:
+                continue  # Blank line, skipped as DictReader did
+
+            data = readings.get(row[codepoint_col])
+
+            if data is not None:
+                pinyins = data['pinyins']
+                freqs = data['freqs']
+
+                # Build combined format: pinyin(freq)|pinyin(freq)
+                pinyin_parts = []
+                for i, pinyin in enumerate(pinyins):
+                    if freqs and i < len(freqs):
+                        pinyin_parts.append(f"{pinyin}({freqs[i]})")
+                    else:
+                        pinyin_parts.append(pinyin)
+
+                pinyin_value = '|'.join(pinyin_parts)
+
+                if len(pinyins) > 1:
+                    multi_pinyin_count += 1
+                if freqs:
+                    has_freq_count += 1
+            else:
+                pinyin_value = ''
+                missing_count += 1
 
-    for row in rows:
-        codepoint = row['codepoint']
-
-        if codepoint in readings:
-            data = readings[codepoint]
-            pinyins = data['pinyins']
-            freqs = data['freqs']
-
-            # Build combined format: pinyin(freq)|pinyin(freq)
-            pinyin_parts = []
-            for i, pinyin in enumerate(pinyins):
-                if freqs and i < len(freqs):
-                    pinyin_parts.append(f"{pinyin}({freqs[i]})")
-                else:
-                    pinyin_parts.append(pinyin)
-
-            row['pinyins'] = '|'.join(pinyin_parts)
-
-            if len(pinyins) > 1:
-                multi_pinyin_count += 1
-            if freqs:
-                has_freq_count += 1
-        else:
-            row['pinyins'] = ''
-            missing_count += 1
-
-    # Write output CSV
-    fieldnames = ['id', 'char', 'codepoint', 'pinyins']
+            writer.writerow([row[i] for i in keep_cols] + [pinyin_value])
 
-    with open(output_csv, 'w', encoding='utf-8', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(rows)
+            if pinyin_value and total < 500 and len(example_rows) < 10:
+                example_rows.append((row[char_col], pinyin_value))
+            total += 1
 
     print(f"\n✓ Created {output_csv}")
-    print(f"  Total characters: {len(rows)}")
-    print(f"  Characters with pinyin: {len(rows) - missing_count}")
+    print(f"  Total characters: {total}")
+    print(f"  Characters with pinyin: {total - missing_count}")
     print(f"  Characters with multiple pinyins: {multi_pinyin_count}")
     print(f"  Characters with frequency data: {has_freq_count}")
     print(f"  Missing pinyin: {missing_count}")
 
     # Show some examples
     print("\nExample entries:")
-    example_count = 0
-    for row in rows[:500]:  # Check first 500
-        if row.get('pinyins'):
-            print(f"  {row['char']} → {row['pinyins']}")
-            example_count += 1
-            if example_count >= 10:  # Show 10 examples
-                break
+    for char, pinyin_value in example_rows:
+        print(f"  {char} → {pinyin_value}")
 
 
 def validate_pinyin_csv(csv_file='../../data/build_artifacts/step2_pinyin.csv'):
@@ -5,21 +5,27 @@ Step 3: Add gloss_en and examples from CC-CEDICT
 - examples: 2-3 common multi-character words containing this character
 """
 import csv
-import re
 from collections import defaultdict
 
+# Fields of a parse_cedict() entry (plain lists index faster than dicts)
+GLOSS = 0
+EXAMPLES = 1
+
+# CJK Unified Ideographs (our character set range)
+CJK_START = 0x4E00
+CJK_END = 0x9FFF
+
 
 def parse_cedict(file_path='../../data/sources/cedict_ts.u8'):
     """
     Parse CC-CEDICT for glosses and example words.
 
     Returns:
-        Dict mapping character -> {
-            'gloss': 'person; people',
-            'examples': ['人丁', '人世', '人中']
-        }
+        Dict mapping character -> [gloss, examples], e.g.
+            ['person; people', ['人丁', '人世', '人中']]
+        (indexed with GLOSS and EXAMPLES)
     """
-    char_data = defaultdict(lambda: {'gloss': '', 'examples': []})
+    char_data = {}
 
     with open(file_path, 'r', encoding='utf-8') as f:
         for line in f:
@@ -28,38 +34,71 @@ def parse_cedict(file_path='../../data/sources/cedict_ts.u8'):
                 continue
 
             # CC-CEDICT format: traditional simplified [pinyin] /gloss1/gloss2/
-            match = re.match(r'^(\S+)\s+(\S+)\s+\[([^\]]+)\]\s+/(.+)/$', line)
-            if not match:
+            # The layout is fixed, so plain splits replace a regex match per line
+            parts = line.split(' ', 2)
+            if len(parts) < 3:
                 continue
 
-            trad, simp, pinyin, glosses = match.groups()
+            trad, simp, rest = parts
+            pinyin_end = rest.find('] /')
+            if not rest.startswith('[') or pinyin_end < 2 or not rest.endswith('/'):
+                continue
 
-            # Split glosses by /
-            gloss_list = [g.strip() for g in glosses.split('/') if g.strip()]
+            pinyin = rest[1:pinyin_end]
+            glosses = rest[pinyin_end + 3:-1]
+            if not glosses:
+                continue
 
-            # For single characters, store gloss (first gloss only)
-            if len(trad) == 1 and not char_data[trad]['gloss']:
-                char_data[trad]['gloss'] = gloss_list[0] if gloss_list else ''
+            # Split glosses by / (CEDICT glosses are never blank or padded)
+            gloss_list = glosses.split('/')
 
-            if len(simp) == 1 and simp != trad and not char_data[simp]['gloss']:
-                char_data[simp]['gloss'] = gloss_list[0] if gloss_list else ''
+            # For single characters, store gloss (first gloss only)
+            if len(trad) == 1:
+                entry = char_data.get(trad)
+                if entry is None:
+                    entry = char_data[trad] = ['', []]
+                if not entry[GLOSS]:
+                    entry[GLOSS] = gloss_list[0] if gloss_list else ''
+
+            if len(simp) == 1 and simp != trad:
+                entry = char_data.get(simp)
+                if entry is None:
+                    entry = char_data[simp] = ['', []]
+                if not entry[GLOSS]:
+                    entry[GLOSS] = gloss_list[0] if gloss_list else ''
 
             # For multi-character words, add as examples
-            # Collect examples for each character (limit to 3 per character)
+            # Collect examples for each character (limit to 3 per character);
+            # characters outside our set never reach the CSV, so skip them
             if len(trad) > 1:
                 for char in trad:
-                    if len(char_data[char]['examples']) < 3:
-                        # Store the word if not already present
-                        if trad not in char_data[char]['examples']:
-                            char_data[char]['examples'].append(trad)
+                    if not CJK_START <= ord(char) <= CJK_END:
+                        continue
+                    entry = char_data.get(char)
+                    if entry is None:
+                        entry = char_data[char] = ['', []]
+                    examples = entry[EXAMPLES]
+                    # Full lists (the common case) skip the membership test
+                    if len(examples) >= 3:
+                        continue
+                    # Store the word if not already present
+                    if trad not in examples:
+                        examples.append(trad)
 
             if len(simp) > 1 and simp != trad:
                 for char in simp:
-                    if len(char_data[char]['examples']) < 3:
-                        if simp not in char_data[char]['examples']:
-                            char_data[char]['examples'].append(simp)
+                    if not CJK_START <= ord(char) <= CJK_END:
+                        continue
+                    entry = char_data.get(char)
+                    if entry is None:
+                        entry = char_data[char] = ['', []]
+                    examples = entry[EXAMPLES]
+                    if len(examples) >= 3:
+                        continue
+                    if simp not in examples:
+                        examples.append(simp)
 
-    return dict(char_data)
+    return char_data
 
 
 def add_cedict_to_csv(input_csv='../../data/build_artifacts/step2_pinyin.csv',
@@ -72,59 +111,66 @@ def add_cedict_to_csv(input_csv='../../data/build_artifacts/step2_pinyin.csv',
 
     print(f"Loaded data for {len(cedict_data)} characters")
 
-    # Read input CSV
-    with open(input_csv, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        rows = list(reader)
+    fieldnames = ['id', 'char', 'codepoint', 'pinyins', 'gloss_en', 'examples']
 
     # Add CEDICT columns
+    total = 0
     has_gloss = 0
     has_examples = 0
     missing_both = 0
-
-    for row in rows:
-        char = row['char']
-
-        if char in cedict_data:
-            data = cedict_data[char]
-            row['gloss_en'] = data['gloss']
-            row['examples'] = '|'.join(data['examples'])
-
-            if data['gloss']:
-                has_gloss += 1
-            if data['examples']:
-                has_examples += 1
-        else:
-            row['gloss_en'] = ''
-            row['examples'] = ''
-            missing_both += 1
-
-    # Write output CSV
-    fieldnames = ['id', 'char', 'codepoint', 'pinyins', 'gloss_en', 'examples']
-
-    with open(output_csv, 'w', encoding='utf-8', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(rows)
+    example_rows = []  # Up to 5 characters with CEDICT data from the first 1000 rows
+
+    # Stream rows from input to output, one at a time
+    with open(input_csv, 'r', encoding='utf-8') as f_in, \
+         open(output_csv, 'w', encoding='utf-8', newline='') as f_out:
+        reader = csv.reader(f_in)
+        header = next(reader)
+        # Input columns carried over, in output order
+        keep_cols = [header.index(name) for name in fieldnames[:-2]]
+        char_col = header.index('char')
+
+        writer = csv.writer(f_out)
+        writer.writerow(fieldnames)
+
+        for row in reader:
+            if not row:
+                continue  # Blank line, skipped as DictReader did
+
+            char = row[char_col]
+            data = cedict_data.get(char)
+
+            if data is not None:
+                gloss_en = data[GLOSS]
+                examples = '|'.join(data[EXAMPLES])
+
+                if data[GLOSS]:
+                    has_gloss += 1
+                if data[EXAMPLES]:
+                    has_examples += 1
+            else:
+                gloss_en = ''
+                examples = ''
+                missing_both += 1
+
+            writer.writerow([row[i] for i in keep_cols] + [gloss_en, examples])
+
+            if (gloss_en or examples) and total < 1000 and len(example_rows) < 5:
+                example_rows.append((char, gloss_en, examples))
+            total += 1
 
     print(f"\n✓ Created {output_csv}")
-    print(f"  Total characters: {len(rows)}")
+    print(f"  Total characters: {total}")
     print(f"  Characters with gloss: {has_gloss}")
     print(f"  Characters with examples: {has_examples}")
     print(f"  Missing both: {missing_both}")
 
     # Show some examples
     print("\nExample entries:")
-    example_count = 0
-    for row in rows[:1000]:
-        if row.get('gloss_en') or row.get('examples'):
-            gloss = row['gloss_en'][:50] if row['gloss_en'] else '(no gloss)'
-            examples = row['examples'][:60] if row['examples'] else '(no examples)'
-            print(f"  {row['char']} → {gloss}")
-            print(f"       examples: {examples}")
-            example_count += 1
-            if example_count >= 5:
-                break
+    for char, gloss_en, examples in example_rows:
+        gloss = gloss_en[:50] if gloss_en else '(no gloss)'
+        examples = examples[:60] if examples else '(no examples)'
+        print(f"  {char} → {gloss}")
+        print(f"       examples: {examples}")
 
 
 def validate_cedict_csv(csv_file='../../data/build_artifacts/step3_cedict.csv'):
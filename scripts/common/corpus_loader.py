@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Shared single-pass loader for the sentence corpus CSV.
+
+Both analyze_corpus_stats.py and audio/enumerate_syllables_unihan.py read
+the char_pinyin_pairs column of cmn_sentences_with_char_pinyin.csv. This
+module walks the file once and returns everything either script needs:
+- Sentence count
+- Script type distribution
+- Used pinyin syllables in tone3 format (neutral tone as '0')
+- Unique Chinese characters (those with pinyin)
+
+Results are memoized in-process and pickled next to the CSV, keyed by the
+file's path, size and mtime, so repeated CLI runs skip the reparse.
+"""
+
+import csv
+import pickle
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+from sys import intern
+from typing import Counter as CounterType, Dict, FrozenSet, List, NamedTuple, Set
+
+# Last character of a pinyin that already carries a tone number
+TONE_DIGITS = frozenset('01234')
+
+# On-disk stats cache, keyed by the CSV's path, size and mtime (and
+# CACHE_VERSION, bumped when _parse_corpus or CorpusStats changes)
+CACHE_FILENAME = '.corpus_cache.pkl'
+CACHE_VERSION = 1
+
+# Script types are buffered and counted in batches via Counter.update
+SCRIPT_TYPE_BATCH_SIZE = 16384
+
+
+class CorpusStats(NamedTuple):
+    sentence_count: int
+    script_type_counts: Dict[str, int]
+    used_syllables: FrozenSet[str]
+    unique_chars: FrozenSet[str]
+
+
+def load_corpus(csv_path: str) -> CorpusStats:
+    """
+    Load corpus statistics, reusing the in-process or on-disk cache when the
+    CSV is unchanged.
+    """
+    path = Path(csv_path).resolve()
+    st = path.stat()
+    return _load_corpus_cached(str(path), st.st_size, st.st_mtime_ns)
+
+
+@lru_cache(maxsize=1)
+def _load_corpus_cached(csv_path: str, size: int, mtime_ns: int) -> CorpusStats:
+    cache_path = Path(csv_path).parent / CACHE_FILENAME
+    cache_key = (CACHE_VERSION, csv_path, size, mtime_ns)
+
+    try:
+        with open(cache_path, 'rb') as f:
+            cached = pickle.load(f)
+        if cached.get('key') == cache_key:
+            return cached['stats']
+    except (OSError, pickle.PickleError, EOFError, ImportError, AttributeError, KeyError):
+        pass
+
+    stats = _parse_corpus(csv_path)
+
+    try:
+        with open(cache_path, 'wb') as f:
+            pickle.dump({'key': cache_key, 'stats': stats}, f, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        pass  # Cache is best-effort (e.g., read-only data directory)
+
+    return stats
+
+
+def _parse_corpus(csv_path: str) -> CorpusStats:
+    """Walk the sentence CSV once and collect all corpus statistics."""
+    sentence_count = 0
+    script_type_counts: CounterType[str] = Counter()
+    distinct_pairs: Set[str] = set()
+
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        reader = csv.reader(f)  # Default delimiter is ','
+
+        # Resolve column positions once instead of building a dict per row
+        header: List[str] = next(reader, [])
+        script_type_idx = header.index('script_type') if 'script_type' in header else None
+        char_pinyin_idx = header.index('char_pinyin_pairs') if 'char_pinyin_pairs' in header else None
+
+        # The corpus repeats a few thousand distinct "char:pinyin" tokens
+        # millions of times, so collect raw tokens first and parse each once
+        distinct_pairs_update = distinct_pairs.update
+        script_types: List[str] = []
+        script_types_append = script_types.append
+
+        for row in reader:
+            sentence_count += 1
+            if script_type_idx is not None and script_type_idx < len(row):
+                script_type = row[script_type_idx]
+            else:
+                script_type = 'unknown'
+            script_types_append(script_type)
+            if len(script_types) >= SCRIPT_TYPE_BATCH_SIZE:
+                script_type_counts.update(script_types)
+                script_types.clear()
+
+            # Parse character-pinyin mapping
+            if char_pinyin_idx is None or char_pinyin_idx >= len(row):
+                continue
+            char_pinyin_str = row[char_pinyin_idx]
+            if not char_pinyin_str:
+                continue
+
+            # Format: 我:wo3|們:men|試:shi4|試:shi4|看:kan4|！:
+            distinct_pairs_update(char_pinyin_str.split('|'))
+
+        script_type_counts.update(script_types)
+
+    used_syllables: Set[str] = set()
+    unique_chars: Set[str] = set()
+
+    for pair in distinct_pairs:
+        char, sep, pinyin = pair.partition(':')
+        pinyin = pinyin.strip()
+        if not sep or not pinyin:  # Skip empty strings (punctuation)
+            continue
+
+        # Only count Chinese characters (those with pinyin)
+        unique_chars.add(char)
+
+        # AWS Polly requires neutral tones to have explicit '0' suffix
+        # Convert "ma" → "ma0" for consistency
+        if pinyin[-1] not in TONE_DIGITS:
+            pinyin = pinyin + '0'
+        # Interned so later membership tests against these are identity hits
+        used_syllables.add(intern(pinyin))
+
+    return CorpusStats(
+        sentence_count=sentence_count,
+        script_type_counts=dict(script_type_counts),
+        used_syllables=frozenset(used_syllables),
+        unique_chars=frozenset(unique_chars),
+    )
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+JSON reading and writing shared by the audio scripts.
+
+orjson (a C JSON encoder/parser) is used when installed; otherwise the
+stdlib json module. Output is the same either way: indented UTF-8 JSON
+with non-ASCII characters written as-is.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict
+
+try:
+    # Optional C JSON encoder; output matches json.dump(indent=2, ensure_ascii=False)
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+# Parse JSON from bytes or str
+loads: Callable[..., Any] = orjson.loads if orjson is not None else json.loads
+
+
+def write_json(path: Path, data: Any) -> None:
+    """Write data as indented UTF-8 JSON, using orjson when available."""
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
+
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def append_ndjson_record(log_file: BinaryIO, record: Dict) -> None:
+    """Append one record to an NDJSON log opened in binary mode (buffered until flushed)."""
+    if orjson is not None:
+        log_file.write(orjson.dumps(record) + b'\n')
+    else:
+        log_file.write(json.dumps(record, ensure_ascii=False).encode('utf-8') + b'\n')
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Plot helpers shared by the character set analysis scripts.
+
+The frequency and coverage charts draw one point per character rank, which
+is far more points than the saved PNG has pixel columns.
+"""
+
+import numpy as np
+
+
+def axes_pixel_columns(ax, dpi):
+    """Width of `ax` in pixels when its figure is saved at `dpi`."""
+    return int(ax.get_position().width * ax.figure.get_figwidth() * dpi)
+
+
+def decimate_monotonic(values, n_cols):
+    """
+    Thin a monotonic series plotted against rank (1..len(values)) down to the
+    first and last point of each of `n_cols` equal-width rank buckets.
+
+    For a monotonic series those two points are the bucket's min and max, so
+    the line drawn through them covers the same pixels as the full series.
+
+    Returns:
+        (ranks, values) arrays of at most 2 * n_cols points
+    """
+    values = np.asarray(values)
+    n = len(values)
+    if n <= 2 * n_cols:
+        return np.arange(1, n + 1), values
+
+    starts = np.linspace(0, n, n_cols, endpoint=False).astype(np.intp)
+    ends = np.append(starts[1:] - 1, n - 1)
+    idx = np.unique(np.concatenate((starts, ends)))
+
+    return idx + 1, values[idx]
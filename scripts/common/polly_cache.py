@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Persistent caches of AWS Polly responses, shared by the audio generation
+scripts.
+
+Audio is stored in a single SQLite file keyed by a BLAKE2 hash of the SSML,
+voice, engine and output format, so re-runs (and the test script) can reuse
+audio for identical requests instead of calling Polly again.
+
+The describe_voices listing used for the startup credentials check is kept
+in a small JSON file for a day, so resumed runs skip that round trip.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+VOICES_CACHE_TTL = 24 * 60 * 60  # seconds
+
+
+class AudioCache:
+    """
+    SQLite store of synthesized audio for one voice/engine/format.
+
+    Safe to share between worker threads.
+    """
+
+    def __init__(self, db_path: Path, voice_id: str, engine: str, output_format: str):
+        self._voice_params = (voice_id, engine, output_format)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS cache (hash BLOB PRIMARY KEY, audio BLOB NOT NULL)'
+        )
+        self._conn.commit()
+
+    def key(self, ssml: str) -> bytes:
+        h = hashlib.blake2b(digest_size=16)
+        for part in (ssml, *self._voice_params):
+            h.update(part.encode('utf-8'))
+            h.update(b'\0')
+        return h.digest()
+
+    def get(self, ssml: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT audio FROM cache WHERE hash = ?', (self.key(ssml),)
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, ssml: str, audio_data: bytes):
+        try:
+            with self._lock:
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO cache (hash, audio) VALUES (?, ?)',
+                    (self.key(ssml), audio_data)
+                )
+                self._conn.commit()
+        except sqlite3.Error as e:
+            print(f"   ⚠ Warning: could not cache audio: {e}")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def describe_voices_cached(
+    polly_client,
+    cache_path: Path,
+    language_code: str,
+    max_age: float = VOICES_CACHE_TTL
+) -> List[Dict]:
+    """
+    Return Polly's voices for language_code, reusing cache_path when it was
+    written less than max_age seconds ago.
+
+    A fresh cache means no Polly call is made, so the credentials are not
+    re-checked; errors from a live call propagate to the caller.
+    """
+    try:
+        if time.time() - cache_path.stat().st_mtime < max_age:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached.get('language_code') == language_code:
+                return cached['voices']
+    except (OSError, ValueError, KeyError):
+        pass  # Missing, unreadable or stale cache: ask Polly
+
+    voices = polly_client.describe_voices(LanguageCode=language_code).get('Voices', [])
+
+    try:
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump({'language_code': language_code, 'voices': voices}, f, ensure_ascii=False)
+    except OSError:
+        pass  # Cache is best-effort (e.g., output directory not created yet)
+
+    return voices
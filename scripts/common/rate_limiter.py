@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Thread-safe request pacing for API calls made from worker threads:
+- TokenBucket caps the request rate
+- AdaptiveConcurrencyLimiter adapts the number of requests in flight
+
+Shared by the AWS Polly audio generation scripts.
+"""
+
+import threading
+import time
+from collections import deque
+
+
+class TokenBucket:
+    """
+    Token bucket allowing up to `burst` requests at once, refilled at `rate`
+    tokens per second.
+
+    acquire() reserves a token and sleeps only until that token is due, so
+    time already spent waiting on slow responses counts toward the pacing.
+    With burst=1 requests are simply spaced 1/rate seconds apart.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self._rate = rate
+        self._capacity = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+
+            # A negative balance is a reservation for a future slot
+            self._tokens -= 1
+            delay = -self._tokens / self._rate if self._tokens < 0 else 0.0
+
+        if delay > 0:
+            time.sleep(delay)
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD limit on the number of requests in flight.
+
+    The limit grows by one after each healthy response (up to max_limit) and
+    is halved when the server throttles, or when the p95 of recent latencies
+    drifts past `latency_tolerance` times the fastest recent response.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int,
+        max_limit: int,
+        latency_window: int = 50,
+        latency_tolerance: float = 2.0
+    ):
+        self._limit = initial_limit
+        self._max_limit = max_limit
+        self._in_flight = 0
+        self._latencies = deque(maxlen=latency_window)
+        self._latency_tolerance = latency_tolerance
+        self._cond = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    def acquire(self):
+        with self._cond:
+            while self._in_flight >= self._limit:
+                self._cond.wait()
+            self._in_flight += 1
+
+    def release(self, latency: float, throttled: bool = False):
+        with self._cond:
+            self._in_flight -= 1
+
+            if throttled:
+                self._decrease()
+            else:
+                self._latencies.append(latency)
+                if len(self._latencies) >= 10 and self._p95_latency() > min(self._latencies) * self._latency_tolerance:
+                    self._decrease()
+                elif self._limit < self._max_limit:
+                    self._limit += 1
+
+            self._cond.notify_all()
+
+    def _decrease(self):
+        self._limit = max(1, self._limit // 2)
+        # Start a fresh latency baseline at the new concurrency level
+        self._latencies.clear()
+
+    def _p95_latency(self) -> float:
+        ordered = sorted(self._latencies)
+        return ordered[int(0.95 * (len(ordered) - 1))]
@@ -12,14 +12,47 @@ Non-Chinese handling:
 - Punctuation: kept as single char with empty pinyin (consistent with other non-Chinese)
 """
 import csv
+import os
 import re
-import jieba
+import sqlite3
+from functools import lru_cache
+from itertools import islice
+from multiprocessing import Pool
+from pathlib import Path
+
+import pypinyin
 from pypinyin import pinyin, Style
 
+try:
+    # Optional C-accelerated drop-in for jieba (same API and dictionary)
+    import jieba_fast as jieba
+except ImportError:
+    import jieba
+
+# Rows handed to the worker pool at a time while streaming the CSV
+STREAM_BATCH_SIZE = 20000
+
+# Buffer size for the large CSV files (open() defaults to 8 KiB)
+IO_BUFFER_SIZE = 1 << 20
+
+# Sentence → char_pinyin_pairs cache (SQLite) kept next to the output CSV
+# between runs. Bump MAPPING_VERSION whenever create_char_pinyin_mapping
+# changes its output.
+CACHE_FILENAME = '.char_pinyin_cache.sqlite'
+MAPPING_VERSION = 1
+
+# Sentences looked up per cache query (older SQLite builds allow at most 999
+# bound parameters per statement)
+CACHE_LOOKUP_CHUNK = 900
+
+# Matches a formatted pair whose token is longer than one char (a multi-char
+# non-Chinese token), e.g. "Jack:" in "我:wo3|叫:jiao4|Jack:|。:"
+HAS_MULTI = re.compile(r'(?:^|\|)[^:|]{2,}:')
+
 
 def is_chinese_char(char):
     """Check if character is a Chinese character."""
-    return bool(re.match(r'[\u4e00-\u9fff]', char))
+    return '\u4e00' <= char <= '\u9fff'
 
 
 def is_fullwidth_char(char):
@@ -70,6 +103,17 @@ def merge_fullwidth_tokens(words):
     return merged
 
 
+@lru_cache(maxsize=200_000)
+def _word_pinyin(word):
+    """
+    Pinyin for each syllable of a jieba word, memoized per word.
+
+    Common words repeat across hundreds of thousands of sentences, so most
+    lookups skip pypinyin entirely.
+    """
+    return tuple(p[0] for p in pinyin(word, style=Style.TONE3, heteronym=False))
+
+
 def create_char_pinyin_mapping(sentence):
     """
     Create character-to-pinyin mapping for a sentence.
@@ -98,7 +142,7 @@ def create_char_pinyin_mapping(sentence):
 
         # Check if this is a multi-character non-Chinese token
         # (English words, numbers like "123", etc.)
-        has_chinese = any(is_chinese_char(c) for c in word)
+        has_chinese = any('\u4e00' <= c <= '\u9fff' for c in word)
         is_multi_char_non_chinese = len(word) > 1 and not has_chinese
 
         if is_multi_char_non_chinese:
@@ -106,7 +150,7 @@ def create_char_pinyin_mapping(sentence):
             char_pinyin_pairs.append((word, ''))
         else:
             # Process character by character
-            word_pinyin = pinyin(word, style=Style.TONE3, heteronym=False)
+            word_pinyin = _word_pinyin(word)
 
             for i, char in enumerate(word):
                 # Skip whitespace characters
@@ -117,7 +161,7 @@ def create_char_pinyin_mapping(sentence):
                 if is_chinese_char(char):
                     # Use pypinyin result for Chinese characters
                     if i < len(word_pinyin):
-                        py = word_pinyin[i][0]
+                        py = word_pinyin[i]
                         char_pinyin_pairs.append((char, py))
                     else:
                         # Shouldn't happen, but handle gracefully
@@ -137,49 +181,171 @@ def format_char_pinyin_pairs(pairs):
     return '|'.join([f"{char}:{py}" for char, py in pairs])
 
 
-def process_sentences(input_file='../../data/sentences/cmn_sentences_classified.csv',
-                     output_file='../../data/sentences/cmn_sentences_with_char_pinyin.csv'):
-    """
-    Add character-to-pinyin mappings to all sentences.
+def _worker(sentence):
+    """Pool worker: map one sentence (module-level so it can be pickled)."""
+    return create_char_pinyin_mapping(sentence)
+
+
+def _cache_key():
+    """Cached mappings are only valid for the same segmenter, dictionary and mapping logic."""
+    # jieba_fast is not known to expose __version__
+    return (MAPPING_VERSION, jieba.__name__, getattr(jieba, '__version__', None), pypinyin.__version__)
+
+
+def open_mapping_cache(cache_path):
     """
-    print("Loading sentences...")
+    Open the previous run's sentence → char_pinyin_pairs cache read-only.
 
-    with open(input_file, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        sentences = list(reader)
+    Returns:
+        sqlite3 connection, or None if there is no cache or it is stale
+    """
+    if not cache_path.exists():
+        return None
+
+    conn = None
+    try:
+        conn = sqlite3.connect(f"file:{cache_path}?mode=ro", uri=True)
+        row = conn.execute("SELECT value FROM meta WHERE name = 'key'").fetchone()
+        if row is not None and row[0] == repr(_cache_key()):
+            return conn
+    except sqlite3.Error:
+        pass
+    if conn is not None:
+        conn.close()
+    return None
+
+
+def lookup_cached_mappings(conn, sentences):
+    """Cached char_pinyin_pairs for those of `sentences` found in the cache."""
+    found = {}
+    if conn is None:
+        return found
+
+    for i in range(0, len(sentences), CACHE_LOOKUP_CHUNK):
+        chunk = sentences[i:i + CACHE_LOOKUP_CHUNK]
+        placeholders = ','.join('?' * len(chunk))
+        found.update(conn.execute(
+            f"SELECT sentence, pairs FROM mappings WHERE sentence IN ({placeholders})", chunk
+        ))
+    return found
+
+
+def create_mapping_cache(path):
+    """
+    Start a fresh cache file that will hold only this run's sentences.
 
-    print(f"Processing {len(sentences):,} sentences...\n")
+    Returns:
+        sqlite3 connection, or None if the cache can't be written
+    """
+    try:
+        path.unlink(missing_ok=True)
+        conn = sqlite3.connect(path)
+        conn.execute('CREATE TABLE meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)')
+        conn.execute('CREATE TABLE mappings (sentence TEXT PRIMARY KEY, pairs TEXT NOT NULL) WITHOUT ROWID')
+        conn.execute("INSERT INTO meta VALUES ('key', ?)", (repr(_cache_key()),))
+        return conn
+    except (OSError, sqlite3.Error):
+        return None  # Cache is best-effort (e.g., read-only data directory)
 
-    # Add character-pinyin mapping to each sentence
-    for i, row in enumerate(sentences, 1):
-        sentence = row['sentence']
 
-        # Generate character-to-pinyin pairs
-        pairs = create_char_pinyin_mapping(sentence)
-        row['char_pinyin_pairs'] = format_char_pinyin_pairs(pairs)
+def process_sentences(input_file='../../data/sentences/cmn_sentences_classified.csv',
+                     output_file='../../data/sentences/cmn_sentences_with_char_pinyin.csv'):
+    """
+    Add character-to-pinyin mappings to all sentences.
 
-        if i % 10000 == 0:
-            print(f"  Processed {i:,} sentences...")
+    Rows are streamed from input to output in batches. Mappings from the
+    previous run are looked up per batch in an on-disk cache, so only new or
+    changed sentences hit jieba and pypinyin, and memory stays at one batch.
+    Each batch's mappings are written to a new cache file that replaces the
+    old one at the end, so only sentences seen this run are kept.
+    """
+    cache_path = Path(output_file).parent / CACHE_FILENAME
+    new_cache_path = cache_path.with_name(cache_path.name + '.tmp')
+    old_cache = open_mapping_cache(cache_path)
+    new_cache = create_mapping_cache(new_cache_path)
+    pool = None  # Started only once a batch has uncached sentences
 
-    # Add sequential IDs
-    for i, row in enumerate(sentences, 1):
-        row['id'] = i
+    if old_cache is not None:
+        print(f"Reusing cached mappings from {cache_path.name}")
+    print("Processing sentences...\n")
 
-    # Write output
     fieldnames = ['id', 'sentence', 'script_type', 'char_pinyin_pairs']
+    examples = []
+    total = 0
 
-    with open(output_file, 'w', encoding='utf-8', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(sentences)
+    # Count sentences by composition while streaming
+    pure_chinese_count = 0
+    has_non_chinese_count = 0
+
+    try:
+        with open(input_file, 'r', encoding='utf-8', buffering=IO_BUFFER_SIZE) as f_in, \
+             open(output_file, 'w', encoding='utf-8', newline='', buffering=IO_BUFFER_SIZE) as f_out:
+            reader = csv.DictReader(f_in)
+            # Plain csv.writer: rows are written as tuples in fieldnames order,
+            # skipping DictWriter's per-row dict-to-list mapping
+            writer = csv.writer(f_out)
+            writer.writerow(fieldnames)
+
+            # Pool.imap drains its whole input up front, so feed it bounded batches
+            while True:
+                batch = list(islice(reader, STREAM_BATCH_SIZE))
+                if not batch:
+                    break
+
+                # Send only sentences without a cached mapping to the workers
+                sentences = list(dict.fromkeys(row['sentence'] for row in batch))
+                batch_pairs = lookup_cached_mappings(old_cache, sentences)
+                todo = [sentence for sentence in sentences if sentence not in batch_pairs]
+                if todo:
+                    if pool is None:
+                        # Load jieba's prefix dict once so forked workers share it copy-on-write
+                        jieba.initialize()
+                        pool = Pool(os.cpu_count())
+                    for sentence, pairs in zip(todo, pool.imap(_worker, todo, chunksize=500)):
+                        batch_pairs[sentence] = format_char_pinyin_pairs(pairs)
+
+                if new_cache is not None:
+                    new_cache.executemany('INSERT OR IGNORE INTO mappings VALUES (?, ?)',
+                                          batch_pairs.items())
+                    new_cache.commit()
+
+                for row in batch:
+                    total += 1
+                    sentence = row['sentence']
+                    pairs_str = batch_pairs[sentence]
+                    writer.writerow((total, sentence, row['script_type'], pairs_str))
+
+                    # Check if any pair is a multi-char token (non-Chinese)
+                    if HAS_MULTI.search(pairs_str):
+                        has_non_chinese_count += 1
+                    else:
+                        pure_chinese_count += 1
+
+                    if len(examples) < 10:
+                        row['char_pinyin_pairs'] = pairs_str
+                        examples.append(row)
+
+                    if total % 10000 == 0:
+                        print(f"  Processed {total:,} sentences...")
+    finally:
+        if pool is not None:
+            pool.terminate()
+        if old_cache is not None:
+            old_cache.close()
+        if new_cache is not None:
+            new_cache.close()
+
+    # The new cache replaces the old one only after a complete run
+    if new_cache is not None:
+        os.replace(new_cache_path, cache_path)
 
     print(f"\n✓ Created {output_file}")
-    print(f"  Total sentences: {len(sentences):,}")
+    print(f"  Total sentences: {total:,}")
 
     # Show some examples
     print("\nExample sentences with character-pinyin mapping:")
     print("="*60)
-    for i, row in enumerate(sentences[:10], 1):
+    for i, row in enumerate(examples, 1):
         print(f"\n{i}. {row['sentence']}")
         print(f"   Type: {row['script_type']}")
         print(f"   Mapping: {row['char_pinyin_pairs'][:100]}{'...' if len(row['char_pinyin_pairs']) > 100 else ''}")
@@ -189,27 +355,11 @@ def process_sentences(input_file='../../data/sentences/cmn_sentences_classified.
     print("VALIDATION")
     print("="*60)
 
-    # Count sentences by composition
-    pure_chinese_count = 0
-    has_non_chinese_count = 0
-
-    for row in sentences:
-        pairs_str = row['char_pinyin_pairs']
-        pairs = [p.split(':')[0] for p in pairs_str.split('|')]
-
-        # Check if any pair is a multi-char token (non-Chinese)
-        has_multi_char_token = any(len(p) > 1 for p in pairs)
-
-        if has_multi_char_token:
-            has_non_chinese_count += 1
-        else:
-            pure_chinese_count += 1
-
     print(f"\nComposition breakdown:")
-    print(f"  Pure Chinese (chars only): {pure_chinese_count:,} ({pure_chinese_count/len(sentences)*100:.1f}%)")
-    print(f"  Has non-Chinese tokens:    {has_non_chinese_count:,} ({has_non_chinese_count/len(sentences)*100:.1f}%)")
+    print(f"  Pure Chinese (chars only): {pure_chinese_count:,} ({pure_chinese_count/total*100:.1f}%)")
+    print(f"  Has non-Chinese tokens:    {has_non_chinese_count:,} ({has_non_chinese_count/total*100:.1f}%)")
 
-    print(f"\n✓ All {len(sentences):,} sentences processed successfully!")
+    print(f"\n✓ All {total:,} sentences processed successfully!")
     print("  Multi-char tokens (English words, numbers) kept as single units.")
     print("  Whitespace characters removed.")
 
@@ -3,7 +3,68 @@
 Analyze sentence composition: pure Chinese vs mixed content.
 """
 import csv
-import re
+from collections import Counter
+from itertools import islice
+
+import numpy as np
+
+# Punctuation counted as part of a pure-Chinese sentence
+PUNCTUATION = frozenset('.,!?;:()[]{}"\'-—…、。，！？；：（）【】「」『』《》')
+
+# Character types, in the order of the composition_counts() columns
+CHAR_TYPES = ('chinese', 'ascii_letters', 'digits', 'punctuation', 'whitespace', 'other')
+
+# Sentence categories, in the order of categorize_counts() codes
+CATEGORIES = ('pure_chinese', 'has_digits', 'has_ascii', 'has_other', 'no_chinese')
+
+# Sentences shown per category in the report
+EXAMPLES_PER_CATEGORY = 5
+
+# Rows classified per vectorized pass while streaming the CSV
+STREAM_BATCH_SIZE = 20000
+
+
+def build_char_type_table():
+    """
+    Map every BMP code point to its index in CHAR_TYPES.
+
+    Nothing outside the BMP is Chinese, ASCII, whitespace or listed
+    punctuation, so those code points are all 'other'.
+    """
+    table = np.full(0x10000, CHAR_TYPES.index('other'), dtype=np.intp)
+    table[[ord(char) for char in PUNCTUATION]] = CHAR_TYPES.index('punctuation')
+    table[[cp for cp in range(0x10000) if chr(cp).isspace()]] = CHAR_TYPES.index('whitespace')
+    table[ord('0'):ord('9') + 1] = CHAR_TYPES.index('digits')
+    table[ord('A'):ord('Z') + 1] = CHAR_TYPES.index('ascii_letters')
+    table[ord('a'):ord('z') + 1] = CHAR_TYPES.index('ascii_letters')
+    table[0x4E00:0xA000] = CHAR_TYPES.index('chinese')
+    return table
+
+
+CHAR_TYPE_TABLE = build_char_type_table()
+
+
+def composition_counts(sentences):
+    """
+    Count each character type in many sentences at once.
+
+    All sentences are classified in one vectorized pass over their joined
+    code points, then counts are binned back to the sentence they came from.
+
+    Returns:
+        int array of shape (len(sentences), len(CHAR_TYPES)); row i holds the
+        counts for sentences[i]
+    """
+    n_types = len(CHAR_TYPES)
+    lengths = np.fromiter(map(len, sentences), dtype=np.intp, count=len(sentences))
+    codepoints = np.frombuffer(''.join(sentences).encode('utf-32-le'), dtype=np.uint32)
+
+    # U+FFFF is 'other', so clamping sends everything beyond the BMP there too
+    types = CHAR_TYPE_TABLE[np.minimum(codepoints, 0xFFFF)]
+    owners = np.repeat(np.arange(len(sentences)), lengths)
+
+    counts = np.bincount(owners * n_types + types, minlength=len(sentences) * n_types)
+    return counts.reshape(len(sentences), n_types)
 
 
 def analyze_character_composition(sentence):
@@ -13,91 +74,96 @@ def analyze_character_composition(sentence):
     Returns:
         dict with counts of each character type
     """
-    counts = {
-        'chinese': 0,
-        'ascii_letters': 0,
-        'digits': 0,
-        'punctuation': 0,
-        'whitespace': 0,
-        'other': 0
-    }
-
-    for char in sentence:
-        if re.match(r'[\u4e00-\u9fff]', char):
-            counts['chinese'] += 1
-        elif re.match(r'[a-zA-Z]', char):
-            counts['ascii_letters'] += 1
-        elif re.match(r'[0-9]', char):
-            counts['digits'] += 1
-        elif re.match(r'[\s]', char):
-            counts['whitespace'] += 1
-        elif re.match(r'[.,!?;:()\[\]{}"\'\-—…、。，！？；：（）【】「」『』《》]', char):
-            counts['punctuation'] += 1
-        else:
-            counts['other'] += 1
-
-    return counts
+    return dict(zip(CHAR_TYPES, composition_counts([sentence])[0].tolist()))
 
 
-def categorize_sentence(counts):
+def categorize_counts(counts):
     """
-    Categorize a sentence based on its character composition.
+    Categorize sentences based on their character composition.
 
-    Categories:
-    - pure_chinese: Only Chinese + punctuation + whitespace
-    - has_digits: Contains numbers
+    Categories (first match wins):
+    - no_chinese: No Chinese characters at all
     - has_ascii: Contains ASCII letters (names, URLs, etc.)
+    - has_digits: Contains numbers
     - has_other: Contains other unicode
+    - pure_chinese: Only Chinese + punctuation + whitespace
+
+    Args:
+        counts: composition_counts() array, one row per sentence
+
+    Returns:
+        int array of indexes into CATEGORIES, one per sentence
     """
-    has_chinese = counts['chinese'] > 0
-    has_ascii = counts['ascii_letters'] > 0
-    has_digits = counts['digits'] > 0
-    has_other = counts['other'] > 0
+    has_chinese = counts[:, CHAR_TYPES.index('chinese')] > 0
+    has_ascii = counts[:, CHAR_TYPES.index('ascii_letters')] > 0
+    has_digits = counts[:, CHAR_TYPES.index('digits')] > 0
+    has_other = counts[:, CHAR_TYPES.index('other')] > 0
+
+    return np.select(
+        [~has_chinese, has_ascii, has_digits, has_other],
+        [CATEGORIES.index(name) for name in ('no_chinese', 'has_ascii', 'has_digits', 'has_other')],
+        default=CATEGORIES.index('pure_chinese'),
+    )
 
-    if not has_chinese:
-        return 'no_chinese'
 
-    if has_ascii:
-        return 'has_ascii'
-    elif has_digits:
-        return 'has_digits'
-    elif has_other:
-        return 'has_other'
-    else:
-        return 'pure_chinese'
+def categorize_sentence(counts):
+    """
+    Categorize one sentence from its analyze_character_composition() counts
+    (see categorize_counts for the categories).
+    """
+    row = np.array([[counts[char_type] for char_type in CHAR_TYPES]])
+    return CATEGORIES[categorize_counts(row)[0]]
 
 
 def analyze_sentences(input_file='../../data/sentences/cmn_sentences_classified.csv'):
     """
     Analyze all sentences and categorize them.
+
+    Rows are streamed in batches; only per-category totals and the first few
+    example sentences of each category are kept.
+
+    Returns:
+        Counter of sentences per category
     """
     print(f"Analyzing sentences from {input_file}...\n")
 
-    with open(input_file, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        sentences = list(reader)
-
     # Categorize all sentences
-    categories = {
-        'pure_chinese': [],
-        'has_digits': [],
-        'has_ascii': [],
-        'has_other': [],
-        'no_chinese': []
-    }
-
-    for row in sentences:
-        sentence = row['sentence']
-        counts = analyze_character_composition(sentence)
-        category = categorize_sentence(counts)
-
-        categories[category].append({
-            'sentence': sentence,
-            'script_type': row['script_type'],
-            'counts': counts
-        })
-
-    total = len(sentences)
+    category_counts = Counter()
+    examples = {category: [] for category in CATEGORIES}
+
+    with open(input_file, 'r', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        sentence_col = header.index('sentence')
+        script_type_col = header.index('script_type')
+
+        while True:
+            batch = list(islice(reader, STREAM_BATCH_SIZE))
+            if not batch:
+                break
+            batch = [row for row in batch if row]  # Skip blank lines, as DictReader did
+
+            # Character counts and categories for the whole batch come from
+            # vectorized passes; no per-sentence Python work
+            batch_counts = composition_counts([row[sentence_col] for row in batch])
+            batch_categories = categorize_counts(batch_counts)
+
+            tallies = np.bincount(batch_categories, minlength=len(CATEGORIES))
+            for code, category in enumerate(CATEGORIES):
+                if tallies[code]:
+                    category_counts[category] += int(tallies[code])
+
+                # Only categories still short of examples look up their rows
+                needed = EXAMPLES_PER_CATEGORY - len(examples[category])
+                if needed > 0 and tallies[code]:
+                    for i in np.flatnonzero(batch_categories == code)[:needed].tolist():
+                        examples[category].append({
+                            'sentence': batch[i][sentence_col],
+                            'script_type': batch[i][script_type_col],
+                            'counts': dict(zip(CHAR_TYPES, batch_counts[i].tolist()))
+                        })
+
+    total = sum(category_counts.values())
 
     # Print statistics
     print("="*60)
@@ -106,11 +172,11 @@ def analyze_sentences(input_file='../../data/sentences/cmn_sentences_classified.
     print(f"\nTotal sentences: {total:,}\n")
 
     print("Composition breakdown:")
-    print(f"  Pure Chinese:        {len(categories['pure_chinese']):6,} ({len(categories['pure_chinese'])/total*100:5.1f}%)")
-    print(f"  Has digits:          {len(categories['has_digits']):6,} ({len(categories['has_digits'])/total*100:5.1f}%)")
-    print(f"  Has ASCII letters:   {len(categories['has_ascii']):6,} ({len(categories['has_ascii'])/total*100:5.1f}%)")
-    print(f"  Has other unicode:   {len(categories['has_other']):6,} ({len(categories['has_other'])/total*100:5.1f}%)")
-    print(f"  No Chinese:          {len(categories['no_chinese']):6,} ({len(categories['no_chinese'])/total*100:5.1f}%)")
+    print(f"  Pure Chinese:        {category_counts['pure_chinese']:6,} ({category_counts['pure_chinese']/total*100:5.1f}%)")
+    print(f"  Has digits:          {category_counts['has_digits']:6,} ({category_counts['has_digits']/total*100:5.1f}%)")
+    print(f"  Has ASCII letters:   {category_counts['has_ascii']:6,} ({category_counts['has_ascii']/total*100:5.1f}%)")
+    print(f"  Has other unicode:   {category_counts['has_other']:6,} ({category_counts['has_other']/total*100:5.1f}%)")
+    print(f"  No Chinese:          {category_counts['no_chinese']:6,} ({category_counts['no_chinese']/total*100:5.1f}%)")
 
     # Show examples of each category
     print("\n" + "="*60)
@@ -118,26 +184,26 @@ def analyze_sentences(input_file='../../data/sentences/cmn_sentences_classified.
     print("="*60)
 
     print("\n1. Pure Chinese (first 5):")
-    for item in categories['pure_chinese'][:5]:
+    for item in examples['pure_chinese']:
         print(f"   {item['sentence']}")
 
     print("\n2. Has digits (first 5):")
-    for item in categories['has_digits'][:5]:
+    for item in examples['has_digits']:
         sentence = item['sentence']
         counts = item['counts']
         print(f"   {sentence}")
         print(f"      (Chinese: {counts['chinese']}, Digits: {counts['digits']})")
 
     print("\n3. Has ASCII letters (first 5):")
-    for item in categories['has_ascii'][:5]:
+    for item in examples['has_ascii']:
         sentence = item['sentence']
         counts = item['counts']
         print(f"   {sentence}")
         print(f"      (Chinese: {counts['chinese']}, ASCII: {counts['ascii_letters']})")
 
-    if categories['has_other']:
+    if examples['has_other']:
         print("\n4. Has other unicode (first 5):")
-        for item in categories['has_other'][:5]:
+        for item in examples['has_other']:
             sentence = item['sentence']
             counts = item['counts']
             print(f"   {sentence}")
@@ -145,10 +211,10 @@ def analyze_sentences(input_file='../../data/sentences/cmn_sentences_classified.
 
     print("\n" + "="*60)
 
-    return categories
+    return category_counts
 
 
 if __name__ == '__main__':
-    categories = analyze_sentences()
+    category_counts = analyze_sentences()
 
     print("\n✓ Analysis complete!")
@@ -4,7 +4,6 @@ Classify Tatoeba sentences as simplified, traditional, neutral, or ambiguous
 based on the script_type of their constituent characters.
 """
 import csv
-import re
 from collections import Counter, defaultdict
 
 
@@ -35,7 +34,8 @@ def extract_chinese_characters(text):
     """
     Extract only Chinese characters from text.
     """
-    chinese_chars = re.findall(r'[\u4e00-\u9fff]', text)
+    # Plain range compare per character, without going through the regex engine
+    chinese_chars = [char for char in text if '\u4e00' <= char <= '\u9fff']
     return chinese_chars
 
 